@@ -0,0 +1,346 @@
+"""Benchmarks del núcleo de flujo máximo.
+
+    python benchmark_flujo.py importacion
+
+mide, en un intérprete nuevo, cuánto tarda ``import nucleo_flujo`` y falla si
+supera el presupuesto o si la importación arrastra tkinter o NumPy.
+
+    python benchmark_flujo.py familias -t 100 1000 10000 -o informe.json
+    python benchmark_flujo.py familias --base informe.json
+
+genera grafos de familias estándar con semilla fija, mide cada algoritmo
+(tiempo, memoria pico y cantidad de aumentos) en un proceso aparte y escribe un
+informe JSON. Falla si los algoritmos no coinciden en el valor del flujo o, con
+``--base``, si alguna medición es más lenta que la del informe anterior.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: sin memoria pico
+    resource = None
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Presupuesto para importar el núcleo (segundos, mejor de varias repeticiones)
+PRESUPUESTO_IMPORTACION = 0.05
+MODULOS_PROHIBIDOS = ("tkinter", "numpy")
+
+
+class FalloBenchmark(Exception):
+    """Una verificación del benchmark no se cumplió (el comando sale con código 1)."""
+
+
+def medir_importacion(modulo="nucleo_flujo", repeticiones=5):
+    # Cada medición usa un proceso nuevo para no contar módulos ya cargados
+    codigo = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"import {modulo}\n"
+        "t = time.perf_counter() - t\n"
+        f"print(t, *[m for m in {MODULOS_PROHIBIDOS!r} if m in sys.modules])\n"
+    )
+    mejor, prohibidos = float("inf"), set()
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=DIRECTORIO,
+                                capture_output=True, text=True, check=True).stdout.split()
+        mejor = min(mejor, float(salida[0]))
+        prohibidos.update(salida[1:])
+    return mejor, sorted(prohibidos)
+
+
+def verificar_importacion(presupuesto=PRESUPUESTO_IMPORTACION):
+    tiempo, prohibidos = medir_importacion()
+    print(f"import nucleo_flujo: {tiempo*1000:.1f} ms (presupuesto {presupuesto*1000:.0f} ms)")
+    # Verificaciones explícitas, no assert: con python -O también tienen que fallar
+    if prohibidos:
+        raise FalloBenchmark(f"La importación del núcleo cargó: {', '.join(prohibidos)}")
+    if tiempo > presupuesto:
+        raise FalloBenchmark(f"La importación del núcleo superó el presupuesto ({tiempo:.3f} s)")
+
+
+# ---------------------------------------
+# Familias de grafos
+# ---------------------------------------
+# Cada generador recibe la cantidad aproximada de aristas y un random.Random
+# con semilla, y devuelve (n, colas, cabezas, capacidades, s, t).
+FAMILIAS = {}
+TAMANOS = (100, 1000, 10000)
+N_MAX_DENSO = 3000  # la matriz n x n del modo denso no entra en memoria más allá
+
+
+def _familia(nombre):
+    def decorador(funcion):
+        FAMILIAS[nombre] = funcion
+        return funcion
+    return decorador
+
+
+@_familia("capas")
+def _grafo_capas(m, azar, grado=3):
+    # Red por capas de ancho w: cada nodo se une a 'grado' nodos de la capa siguiente
+    w = max(2, int(math.sqrt(m / grado)))
+    k = max(2, m // (w*grado))
+    s, t = k*w, k*w + 1
+    colas, cabezas, caps = [], [], []
+    for j in range(w):
+        colas += [s, (k-1)*w + j]; cabezas += [j, t]; caps += [10*grado, 10*grado]
+    for capa in range(k - 1):
+        for j in range(w):
+            for _ in range(grado):
+                colas.append(capa*w + j)
+                cabezas.append((capa + 1)*w + azar.randrange(w))
+                caps.append(azar.randint(1, 20))
+    return k*w + 2, colas, cabezas, caps, s, t
+
+
+@_familia("cuadricula")
+def _grafo_cuadricula(m, azar):
+    # Cuadrícula L x L con aristas a la derecha, arriba y abajo; s y t a los costados
+    lado = max(2, int(math.sqrt(m / 3)))
+    s, t = lado*lado, lado*lado + 1
+    colas, cabezas, caps = [], [], []
+    for f in range(lado):
+        colas += [s, f*lado + lado - 1]; cabezas += [f*lado, t]; caps += [100, 100]
+        for c in range(lado):
+            v = f*lado + c
+            vecinos = ([v + 1] if c + 1 < lado else []) + ([v + lado] if f + 1 < lado else []) + ([v - lado] if f else [])
+            for w in vecinos:
+                colas.append(v); cabezas.append(w); caps.append(azar.randint(1, 50))
+    return lado*lado + 2, colas, cabezas, caps, s, t
+
+
+@_familia("aleatorio")
+def _grafo_aleatorio(m, azar, grado=4):
+    # Erdős–Rényi G(n, m) dirigido, grado medio 'grado'
+    n = max(2, m // grado)
+    colas, cabezas, caps = [], [], []
+    while len(colas) < m:
+        u, v = azar.randrange(n), azar.randrange(n)
+        if u != v:
+            colas.append(u); cabezas.append(v); caps.append(azar.randint(1, 100))
+    return n, colas, cabezas, caps, 0, n - 1
+
+
+@_familia("ak")
+def _grafo_ak(m, azar):
+    # Estilo AK (Cherkassky–Goldberg): en el primer módulo cada salida de s está a
+    # una distancia distinta de t, lo que fuerza Θ(n) fases BFS; en el segundo el
+    # exceso recorre una cadena de capacidades decrecientes. Es determinista.
+    k = max(2, m // 4)
+    x = list(range(k))          # módulo 1
+    y = list(range(k, 2*k))     # módulo 2
+    s, t = 2*k, 2*k + 1
+    colas, cabezas, caps = [], [], []
+    for i in range(k):
+        colas.append(s); cabezas.append(x[i]); caps.append(1)
+        if i + 1 < k:
+            colas.append(x[i]); cabezas.append(x[i+1]); caps.append(k)
+            colas.append(y[i]); cabezas.append(y[i+1]); caps.append(k - i - 1)
+        colas.append(y[i]); cabezas.append(t); caps.append(1)
+    colas += [x[-1], s]; cabezas += [t, y[0]]; caps += [k, k]
+    return 2*k + 2, colas, cabezas, caps, s, t
+
+
+@_familia("bipartito")
+def _grafo_bipartito(m, azar, grado=3):
+    # Emparejamiento bipartito k x k con capacidades unitarias
+    k = max(1, m // (grado + 2))
+    s, t = 2*k, 2*k + 1
+    colas, cabezas, caps = [], [], []
+    for i in range(k):
+        colas += [s, k + i]; cabezas += [i, t]; caps += [1, 1]
+        for j in azar.sample(range(k), min(grado, k)):
+            colas.append(i); cabezas.append(k + j); caps.append(1)
+    return 2*k + 2, colas, cabezas, caps, s, t
+
+
+@_familia("cadena")
+def _grafo_cadena(m, azar):
+    # Cadena larga con una arista de retroceso cada tres nodos
+    n = max(2, 3*m // 4)
+    colas, cabezas, caps = [], [], []
+    for i in range(n - 1):
+        colas.append(i); cabezas.append(i + 1); caps.append(azar.randint(5, 100))
+        if i % 3 == 0:
+            colas.append(i + 1); cabezas.append(i); caps.append(azar.randint(1, 10))
+    return n, colas, cabezas, caps, 0, n - 1
+
+
+def generar(familia, aristas, semilla=1):
+    return FAMILIAS[familia](aristas, random.Random(f"{familia}:{aristas}:{semilla}"))
+
+
+# ---------------------------------------
+# Medición
+# ---------------------------------------
+def _memoria_pico_kb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico  # macOS informa bytes
+
+
+def _medir(conexion, familia, aristas, semilla, algoritmo):
+    # Se ejecuta en un proceso nuevo: la memoria pico es solo de esta medición
+    from nucleo_flujo import ALGORITMOS, GrafoResidual, MonitorFlujo
+    try:
+        n, colas, cabezas, caps, s, t = generar(familia, aristas, semilla)
+        if algoritmo == "denso":
+            # El modo denso importa NumPy al primer uso: importarlo antes de la
+            # memoria base, para no contar el módulo como memoria del algoritmo
+            try:
+                import numpy
+            except ImportError:
+                pass
+        memoria_base = _memoria_pico_kb()
+        inicio = time.perf_counter()
+        grafo = GrafoResidual(n, colas, cabezas, caps)
+        construccion = time.perf_counter() - inicio
+        monitor = MonitorFlujo()
+        inicio = time.perf_counter()
+        valor = ALGORITMOS[algoritmo](grafo, s, t, monitor)
+        segundos = time.perf_counter() - inicio
+        memoria_pico = _memoria_pico_kb()
+        conexion.send({"n": n, "m": len(colas), "valor": valor, "segundos": segundos,
+                       "segundos_construccion": construccion, "aumentos": monitor.aumentos,
+                       "memoria_pico_kb": memoria_pico,
+                       "memoria_solver_kb": None if memoria_pico is None else memoria_pico - memoria_base})
+    except Exception as e:
+        conexion.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conexion.close()
+
+
+def medir(familia, aristas, algoritmo, semilla=1, limite=120):
+    contexto = multiprocessing.get_context()
+    receptor, emisor = contexto.Pipe(duplex=False)
+    proceso = contexto.Process(target=_medir, args=(emisor, familia, aristas, semilla, algoritmo))
+    proceso.start()
+    emisor.close()
+    try:
+        if receptor.poll(limite):
+            resultado = receptor.recv()
+        else:
+            resultado = {"error": f"superó el límite de {limite} s"}
+    except EOFError:
+        resultado = {"error": "el proceso de medición terminó sin resultado"}
+    if proceso.is_alive():
+        proceso.terminate()
+    proceso.join()
+    return {"familia": familia, "aristas_objetivo": aristas, "algoritmo": algoritmo, **resultado}
+
+
+def correr_familias(familias, tamanos, algoritmos, semilla=1, limite=120, salida=sys.stdout):
+    resultados = []
+    for familia in familias:
+        for aristas in tamanos:
+            grupo = []
+            for algoritmo in algoritmos:
+                n = generar(familia, aristas, semilla)[0] if algoritmo == "denso" else 0
+                if n > N_MAX_DENSO:
+                    r = {"familia": familia, "aristas_objetivo": aristas, "algoritmo": algoritmo,
+                         "omitido": f"n = {n} supera {N_MAX_DENSO} para la matriz densa"}
+                else:
+                    r = medir(familia, aristas, algoritmo, semilla, limite)
+                grupo.append(r)
+                print(_linea_resultado(r), file=salida, flush=True)
+            # Todos los algoritmos deben coincidir en el valor del flujo
+            valores = [r["valor"] for r in grupo if "valor" in r]
+            if valores and max(valores) - min(valores) > 1e-6 * max(1, abs(max(valores))):
+                for r in grupo:
+                    r["discrepancia"] = True
+            resultados += grupo
+    return resultados
+
+
+def _linea_resultado(r):
+    nombre = f"{r['familia']:<11}{r['aristas_objetivo']:>9} {r['algoritmo']:<15}"
+    if "error" in r or "omitido" in r:
+        return f"{nombre} {r.get('error') or 'omitido: ' + r['omitido']}"
+    memoria = "" if r["memoria_solver_kb"] is None else f"{r['memoria_solver_kb']/1024:8.1f} MB"
+    return f"{nombre} {r['segundos']:9.4f} s {r['aumentos']:>9} aum. {memoria}  flujo={r['valor']}"
+
+
+def mejores_por_familia(resultados):
+    # Algoritmo más rápido para cada (familia, tamaño)
+    mejores = {}
+    for r in resultados:
+        if "segundos" in r:
+            clave = (r["familia"], r["aristas_objetivo"])
+            if clave not in mejores or r["segundos"] < mejores[clave]["segundos"]:
+                mejores[clave] = r
+    return {clave: r["algoritmo"] for clave, r in mejores.items()}
+
+
+def comparar_informes(base, resultados, tolerancia=0.25, minimo=0.01):
+    # Mediciones más lentas que las del informe base en más de 'tolerancia'
+    # (se ignoran las que duran menos de 'minimo' segundos: son ruido)
+    anteriores = {(r["familia"], r["aristas_objetivo"], r["algoritmo"]): r for r in base["resultados"]}
+    regresiones = []
+    for r in resultados:
+        previo = anteriores.get((r["familia"], r["aristas_objetivo"], r["algoritmo"]))
+        if previo is None or "segundos" not in previo or "segundos" not in r:
+            continue
+        if r["segundos"] > minimo and r["segundos"] > previo["segundos"] * (1 + tolerancia):
+            regresiones.append((r, previo))
+    return regresiones
+
+
+def main(argv=None):
+    from nucleo_flujo import ALGORITMOS
+    parser = argparse.ArgumentParser(description="Benchmarks del núcleo de flujo máximo.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    imp = sub.add_parser("importacion", help="tiempo de importación del núcleo")
+    imp.add_argument("--presupuesto", type=float, default=PRESUPUESTO_IMPORTACION, help="segundos")
+    fam = sub.add_parser("familias", help="tiempos por familia de grafos, tamaño y algoritmo")
+    fam.add_argument("-f", "--familias", nargs="+", choices=sorted(FAMILIAS), default=list(FAMILIAS))
+    fam.add_argument("-t", "--tamanos", nargs="+", type=int, default=list(TAMANOS), help="aristas aproximadas (10^2 a 10^6)")
+    fam.add_argument("-a", "--algoritmos", nargs="+", choices=sorted(ALGORITMOS), default=list(ALGORITMOS))
+    fam.add_argument("--semilla", type=int, default=1)
+    fam.add_argument("--limite", type=float, default=120, help="segundos máximos por medición")
+    fam.add_argument("-o", "--salida", help="informe JSON")
+    fam.add_argument("--base", help="informe anterior con el que comparar tiempos")
+    fam.add_argument("--tolerancia", type=float, default=0.25, help="regresión admitida (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "importacion":
+            verificar_importacion(args.presupuesto)
+        elif args.comando == "familias":
+            resultados = correr_familias(args.familias, args.tamanos, args.algoritmos, args.semilla, args.limite)
+            for (familia, aristas), algoritmo in mejores_por_familia(resultados).items():
+                print(f"más rápido en {familia} ({aristas} aristas): {algoritmo}")
+            if args.salida:
+                informe = {"version": 1, "python": platform.python_version(), "plataforma": platform.platform(),
+                           "semilla": args.semilla, "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "resultados": resultados}
+                with open(args.salida, "w", encoding="utf-8") as f:
+                    json.dump(informe, f, ensure_ascii=False, indent=1)
+            discrepancias = sorted({(r["familia"], r["aristas_objetivo"]) for r in resultados if r.get("discrepancia")})
+            if discrepancias:
+                raise FalloBenchmark(f"Los algoritmos no coinciden en el flujo de: {discrepancias}")
+            if args.base:
+                with open(args.base, "r", encoding="utf-8") as f:
+                    regresiones = comparar_informes(json.load(f), resultados, args.tolerancia)
+                for r, previo in regresiones:
+                    print(f"regresión: {r['familia']} {r['aristas_objetivo']} {r['algoritmo']}: "
+                          f"{previo['segundos']:.4f} s -> {r['segundos']:.4f} s", file=sys.stderr)
+                if regresiones:
+                    raise FalloBenchmark(f"{len(regresiones)} mediciones más lentas que el informe base")
+    except FalloBenchmark as e:
+        print(f"FALLO: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Caché de resultados de flujo máximo, direccionada por contenido.
+
+La clave es un SHA-256 de la red canónica: aristas agregadas por par (u, v) y
+ordenadas, más origen y destino. Dos redes iguales tienen la misma clave sin
+importar el orden en que se agregaron sus aristas ni el algoritmo usado.
+
+Cada resultado guarda el valor y el flujo bruto por arista (lo necesario para
+reconstruir el grafo residual sin volver a resolver). En memoria se mantiene
+un LRU acotado por tamaño; con ``directorio`` además se escribe cada entrada
+como JSON en disco, que sirve entre ejecuciones y entre procesos.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+MAX_BYTES_MEMORIA = 64 * 1024 * 1024
+
+
+def _canonico(c):
+    # 7 y 7.0 son la misma capacidad
+    return int(c) if isinstance(c, float) and c.is_integer() else c
+
+
+class CacheFlujo:
+    """LRU de resultados ``{"valor": .., "flujos": {(u, v): f}}`` por clave.
+
+    ``max_bytes`` acota el tamaño (estimado como el largo del JSON) de las
+    entradas en memoria; las menos usadas se descartan primero. Se puede usar
+    desde varios hilos.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES_MEMORIA, directorio=None):
+        self.max_bytes = max_bytes
+        self.directorio = directorio
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()  # clave -> (resultado, tamaño)
+        self._candado = threading.Lock()
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(aristas, origen, destino):
+        # 'aristas' ya agregadas: una (u, v, c) por par, en cualquier orden
+        # (repr ordena igual IDs de tipos mezclados, en cualquier proceso)
+        filas = sorted(((u, v, _canonico(c)) for u, v, c in aristas), key=repr)
+        texto = json.dumps([origen, destino, filas], ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, clave):
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[0]
+        texto = self._leer_disco(clave)
+        resultado = None
+        if texto is not None:
+            try:
+                resultado = _decodificar(texto)
+            except (ValueError, KeyError, TypeError):
+                pass  # archivo dañado o de otro formato: se resuelve de nuevo
+        if resultado is None:
+            with self._candado:
+                self.fallos += 1
+            return None
+        with self._candado:
+            self.aciertos += 1
+            self._agregar(clave, resultado, len(texto))
+        return resultado
+
+    def guardar(self, clave, valor, flujos):
+        resultado = {"valor": valor, "flujos": dict(flujos)}
+        texto = json.dumps({"valor": valor, "flujos": [[u, v, f] for (u, v), f in resultado["flujos"].items()]},
+                           ensure_ascii=False)
+        with self._candado:
+            self._agregar(clave, resultado, len(texto))
+        if self.directorio:
+            ruta = self._ruta(clave)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                f.write(texto)
+            os.replace(temporal, ruta)  # atómico: otro proceso nunca ve un archivo a medias
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def _agregar(self, clave, resultado, tam):
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior[1]
+        if tam > self.max_bytes:
+            return
+        self._entradas[clave] = (resultado, tam)
+        self.bytes += tam
+        while self.bytes > self.max_bytes:
+            _, (_, viejo) = self._entradas.popitem(last=False)
+            self.bytes -= viejo
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave[:2], clave + ".json")
+
+    def _leer_disco(self, clave):
+        if not self.directorio:
+            return None
+        try:
+            with open(self._ruta(clave), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+def _decodificar(texto):
+    datos = json.loads(texto)
+    return {"valor": datos["valor"], "flujos": {(u, v): f for u, v, f in datos["flujos"]}}
@@ -0,0 +1,139 @@
+"""Cortes mínimos entre todos los pares de nodos (árbol de Gomory–Hu).
+
+El árbol se construye con el método de Gusfield: N-1 cálculos de flujo máximo
+sobre un único grafo residual que se reinicia entre uno y otro. Como el árbol
+solo existe para grafos no dirigidos, cada par {u, v} tiene capacidad
+c(u, v) + c(v, u).
+"""
+from nucleo_flujo import ALGORITMOS, GrafoResidual, TablaNodos
+
+
+class ArbolGomoryHu:
+    """Árbol de cortes: ``padre[i]`` y ``peso[i]`` son la arista del nodo i a su
+    padre (la raíz es su propio padre). El corte mínimo entre dos nodos es el
+    menor peso del camino que los une en el árbol.
+    """
+
+    def __init__(self, nodos, padre, peso):
+        self.nodos = nodos
+        self.indice = {nid: i for i, nid in enumerate(nodos)}
+        self.padre = padre
+        self.peso = peso
+
+        # Profundidades, para subir desde ambos extremos hasta el ancestro común
+        profundidad = [-1]*len(nodos)
+        for i in range(len(nodos)):
+            camino = []
+            while profundidad[i] < 0 and padre[i] != i:
+                camino.append(i)
+                i = padre[i]
+            if profundidad[i] < 0:
+                profundidad[i] = 0
+            for j in reversed(camino):
+                profundidad[j] = profundidad[padre[j]] + 1
+        self.profundidad = profundidad
+
+    def aristas(self):
+        nodos, padre, peso = self.nodos, self.padre, self.peso
+        return [(nodos[i], nodos[padre[i]], peso[i]) for i in range(len(nodos)) if padre[i] != i]
+
+    def _arista_minima(self, u, v):
+        # Nodo hijo de la arista de menor peso en el camino u..v (O(largo del camino))
+        if u not in self.indice or v not in self.indice:
+            raise ValueError("El nodo no está en el árbol.")
+        if u == v:
+            raise ValueError("El origen y el destino no pueden ser el mismo nodo.")
+        i, j = self.indice[u], self.indice[v]
+        padre, peso, profundidad = self.padre, self.peso, self.profundidad
+        minima = None
+        while i != j:
+            if profundidad[i] < profundidad[j]:
+                i, j = j, i
+            if minima is None or peso[i] < peso[minima]:
+                minima = i
+            i = padre[i]
+        return minima
+
+    def corte_minimo(self, u, v):
+        return self.peso[self._arista_minima(u, v)]
+
+    def particion(self, u, v):
+        # IDs del lado de u en un corte mínimo u-v: quitar la arista mínima del árbol
+        corte = self._arista_minima(u, v)
+        vecinos = [[] for _ in self.nodos]
+        for i, p in enumerate(self.padre):
+            if i != p and i != corte:
+                vecinos[i].append(p)
+                vecinos[p].append(i)
+        inicio = self.indice[u]
+        lado = {inicio}
+        cola = [inicio]
+        for x in cola:
+            for y in vecinos[x]:
+                if y not in lado:
+                    lado.add(y)
+                    cola.append(y)
+        return {self.nodos[x] for x in lado}
+
+
+def arbol_gomory_hu(aristas, algoritmo="dinic", tabla=None, monitor=None):
+    """Construye el ``ArbolGomoryHu`` de la versión no dirigida de ``aristas``.
+
+    ``monitor`` (un ``MonitorFlujo``) recibe como progreso la cantidad de
+    flujos calculados y permite cancelar entre uno y otro.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    if tabla is None:
+        tabla = TablaNodos()
+        for u,v,_ in aristas:
+            tabla.agregar(u)
+            tabla.agregar(v)
+    nodos, idx = tabla.ids[:], tabla.indice
+    n = len(nodos)
+
+    # Capacidad no dirigida por par {u, v}; cada par es un arco con su inverso
+    agg = {}
+    try:
+        for u,v,c in aristas:
+            u, v = idx[u], idx[v]
+            if u != v:
+                par = (u, v) if u < v else (v, u)
+                agg[par] = agg.get(par, 0) + c
+    except KeyError as e:
+        raise ValueError(f"El nodo {e.args[0]!r} no está en la tabla de nodos.") from None
+    pares = [p for p, c in agg.items() if c > 0]
+    capacidades = [agg[p] for p in pares]
+    grafo = GrafoResidual(n, [u for u,_ in pares], [v for _,v in pares], capacidades, capacidades)
+    inicio, cabeza, capacidad, residual = grafo.inicio, grafo.cabeza, grafo.capacidad, grafo.residual
+    resolver = ALGORITMOS[algoritmo]
+
+    padre = [0]*n
+    peso = [0]*n
+    lado = [0]*n  # marca = número de iteración si el nodo quedó del lado de s
+    for s in range(1, n):
+        if monitor is not None:
+            monitor.progreso(s - 1)
+        t = padre[s]
+        residual[:] = capacidad
+        flujo = resolver(grafo, s, t)
+
+        # Lado de s en el corte mínimo: alcanzables en el residual
+        lado[s] = s
+        cola = [s]
+        for x in cola:
+            for a in range(inicio[x], inicio[x+1]):
+                y = cabeza[a]
+                if residual[a] > 0 and lado[y] != s:
+                    lado[y] = s
+                    cola.append(y)
+
+        peso[s] = flujo
+        for x in cola:
+            if x != s and padre[x] == t:
+                padre[x] = s
+        if lado[padre[t]] == s:
+            padre[s], padre[t] = padre[t], s
+            peso[s], peso[t] = peso[t], flujo
+    # El nodo 0 nunca cambia de padre: queda como raíz (padre[0] == 0)
+    return ArbolGomoryHu(nodos, padre, peso)
@@ -1,77 +1,25 @@
-import tkinter as tk
-from tkinter import messagebox, filedialog
 import json
 import math
 import random
-import string
-
-
-def ford_fulkerson(n, aristas, origen, destino):
-    # Obtener la lista única y ordenada de nodos
-    nodos = sorted(list(set([u for u,_,_ in aristas] + [v for _,v,_ in aristas])))
-    
-    if origen not in nodos or destino not in nodos:
-        raise ValueError("El nodo origen o destino no está presente.")
-        
-    # Mapeo de IDs de nodo a índices de matriz
-    idx = {nodo:i for i,nodo in enumerate(nodos)}
-    rev = {i:nodo for nodo,i in idx.items()}
-
-    N = len(nodos)
-    capacidad = [[0]*N for _ in range(N)]
-    for u,v,c in aristas:
-        # Sumar capacidades si hay múltiples aristas entre los mismos nodos
-        capacidad[idx[u]][idx[v]] += c
-
-    flujo = [[0]*N for _ in range(N)]
-
-    # Función DFS para encontrar un camino de aumento
-    def dfs(u, t, visitado, padre):
-        if u == t:
-            return float("inf")
-        visitado[u] = True
-        for v in range(N):
-            # Capacidad residual: capacidad original - flujo actual
-            residual = capacidad[u][v] - flujo[u][v]
-            if residual > 0 and not visitado[v]:
-                padre[v] = u
-                cuello = dfs(v, t, visitado, padre)
-                if cuello > 0:
-                    return min(cuello, residual)
-        return 0
-
-    s, t = idx[origen], idx[destino]
-    flujo_maximo = 0
-    
-    # Bucle principal de Ford-Fulkerson
-    while True:
-        padre = [-1]*N
-        visitado = [False]*N
-        padre[s] = s
-        
-        aumento = dfs(s, t, visitado, padre)
-        
-        if aumento <= 0:
-            break
-            
-        # Actualizar el flujo a lo largo del camino encontrado
-        v = t
-        while v != s:
-            u = padre[v]
-            flujo[u][v] += aumento
-            flujo[v][u] -= aumento
-            v = u
-        flujo_maximo += aumento
-
-    flujo_pares = {}
-    for u in range(N):
-        for v in range(N):
-            if capacidad[u][v] > 0:
-                f = flujo[u][v]
-                # Solo guardar flujos mayores a 0 para visualización
-                flujo_pares[(rev[u], rev[v])] = f if f > 0 else 0
-
-    return flujo_maximo, flujo_pares, nodos
+import threading
+
+from cache_flujo import CacheFlujo
+from cortes_flujo import arbol_gomory_hu
+from layout_grafo import DisposicionFuerzas, disposicion_capas
+from nucleo_flujo import (ALGORITMOS, ETIQUETAS_ALGORITMOS, CalculoCancelado, EventosFlujo, MonitorFlujo,
+                          TablaNodos, convertir_capacidad, ford_fulkerson, resolver_flujo)
+
+# tkinter se carga al construir FlujoMaximoGUI: el módulo se puede importar sin Tk
+tk = messagebox = filedialog = None
+
+
+def _importar_tk():
+    global tk, messagebox, filedialog
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as _messagebox, filedialog as _filedialog
+        tk, messagebox, filedialog = tkinter, _messagebox, _filedialog
+
 
 # ---------------------------------------
 # GUI
@@ -79,6 +27,15 @@ def ford_fulkerson(n, aristas, origen, destino):
 RADIO_NODO = 20 # Nodos un poco más grandes
 TAM_FLECHA = 10
 ESPACIO_ARISTA = 14 # Más espacio para separar líneas bidireccionales
+CELDA_ESPACIAL = 4 * RADIO_NODO # Lado de las celdas del índice espacial (coordenadas del mundo)
+ZOOM_MIN, ZOOM_MAX = 0.05, 4.0
+ZOOM_ETIQUETAS = 0.5 # Por debajo de este zoom no se dibujan capacidades ni flujos
+INTERVALO_PROGRESO = 100 # ms entre consultas al cálculo en segundo plano
+DURACION_ANIMACION = 6000 # ms aproximados para reproducir todos los caminos
+CUADRO_MIN = 30 # ms mínimos entre cuadros de la animación
+CANTIDAD_EJEMPLOS = 5 # ejemplos por lote en "Varios Ejemplos"
+INTERVALO_DISPOSICION = 15 # ms entre pasos de la disposición por fuerzas
+PRESUPUESTO_DISPOSICION = 0.03 # s de cálculo de la disposición por paso
 
 
 COLORES = {
@@ -91,6 +48,11 @@ COLORES = {
     "arista": "#aab2cf", 
     "arista_sat": "#ffcc00", 
     "arista_flujo_texto": "#ffffff",
+    "arista_camino": "#00d1ff",
+    "arista_corte": "#ff6b9a",
+    "lado_origen": "#22b14c",
+    "lado_destino": "#f44336",
+    "arbol": "#b388ff",
     "cuadricula": "#1a2447",
 }
 
@@ -98,28 +60,164 @@ COLORES = {
 BOTON_DEFAULT_BG = "#5c7cbe"  
 BOTON_DEFAULT_ACT = "#7d97d1" 
 
+
+def _nombres_nodos(n):
+    # A, B, ..., Z, AA, AB, ... (como las columnas de una hoja de cálculo)
+    nombres = []
+    for i in range(n):
+        nombre = ""
+        i += 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            nombre = chr(ord("A") + r) + nombre
+        nombres.append(nombre)
+    return nombres
+
+
+def _etiqueta_nodo(nid):
+    # Recortar IDs largos para que quepan dentro del círculo
+    texto = str(nid)
+    return texto if len(texto) <= 6 else texto[:5] + "…"
+
+
+class IndiceAristas:
+    """Índice de las aristas del modelo de la GUI.
+
+    Mantiene la capacidad agregada por par (u, v) (que también sirve para saber
+    en O(1) si existe la arista opuesta) y los pares incidentes a cada nodo.
+    Se actualiza al agregar, quitar o cargar aristas, no en cada repintado.
+    """
+
+    def __init__(self, aristas=()):
+        self.capacidad = {}   # (u, v) -> capacidad total
+        self.incidentes = {}  # nid -> conjunto de pares (u, v)
+        for u,v,c in aristas:
+            self.agregar(u,v,c)
+
+    def agregar(self, u, v, c):
+        par = (u,v)
+        if par not in self.capacidad:
+            self.capacidad[par] = 0
+            self.incidentes.setdefault(u, set()).add(par)
+            self.incidentes.setdefault(v, set()).add(par)
+        self.capacidad[par] += c
+
+    def quitar(self, u, v):
+        par = (u,v)
+        if self.capacidad.pop(par, None) is None:
+            return False
+        for nid in par:
+            self.incidentes[nid].discard(par)
+        return True
+
+    def tiene_opuesta(self, u, v):
+        return (v,u) in self.capacidad
+
+    def incidentes_a(self, nid):
+        return self.incidentes.get(nid, ())
+
+
+class IndiceEspacial:
+    """Cuadrícula uniforme sobre las posiciones de los nodos.
+
+    Permite encontrar el nodo bajo el cursor y los nodos de una región visible
+    revisando solo las celdas involucradas, no todos los nodos.
+    """
+
+    def __init__(self, nodos=None, celda=CELDA_ESPACIAL):
+        self.celda = celda
+        self.celdas = {}  # (cx, cy) -> conjunto de nids
+        self.celda_de = {}  # nid -> (cx, cy)
+        for nid, pos in (nodos or {}).items():
+            self.mover(nid, pos["x"], pos["y"])
+
+    def _clave(self, x, y):
+        return (int(x // self.celda), int(y // self.celda))
+
+    def mover(self, nid, x, y):
+        # Inserta el nodo o lo cambia de celda si hace falta
+        clave = self._clave(x, y)
+        anterior = self.celda_de.get(nid)
+        if anterior == clave:
+            return
+        if anterior is not None:
+            self.celdas[anterior].discard(nid)
+            if not self.celdas[anterior]:
+                del self.celdas[anterior]
+        self.celdas.setdefault(clave, set()).add(nid)
+        self.celda_de[nid] = clave
+
+    def quitar(self, nid):
+        clave = self.celda_de.pop(nid, None)
+        if clave is not None:
+            self.celdas[clave].discard(nid)
+            if not self.celdas[clave]:
+                del self.celdas[clave]
+
+    def en_rectangulo(self, x0, y0, x1, y1):
+        # Nodos de las celdas que tocan el rectángulo (candidatos, sin filtrar)
+        (cx0, cy0), (cx1, cy1) = self._clave(x0, y0), self._clave(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.celdas):
+            # Rectángulo más grande que lo ocupado: recorrer solo celdas con nodos
+            for (cx, cy), nids in self.celdas.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield from nids
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield from self.celdas.get((cx, cy), ())
+
+
 class FlujoMaximoGUI:
-    def __init__(self, raiz):
-        self.raiz = raiz
-        self.raiz.title("Flujo Máximo – Ford–Fulkerson (DFS) Estilo Moderno")
+    def __init__(self, raiz=None):
+        _importar_tk()
+        self.raiz = raiz if raiz is not None else tk.Tk()
+        self.raiz.title("Flujo Máximo – Estilo Moderno")
         self.raiz.configure(bg=COLORES["fondo"])
         self.raiz.minsize(1100, 650)
 
         # Estado del grafo
         self.nodos = {}
+        self.tabla_nodos = TablaNodos() # IDs de nodo -> índices enteros para el solver
+        self.indice_espacial = IndiceEspacial() # Posiciones de nodos por celda, para picking y recorte
         self.aristas = [] # Lista de tuplas (u, v, capacidad)
+        self.indice = IndiceAristas() # Capacidades agregadas e incidencias de self.aristas
         self.origen = None
         self.destino = None
         self.ultimo_flujo = None
+        self.calculo = None # Cálculo en segundo plano en curso (ver ejecutar_flujo_maximo)
+        self.animacion = None # Reproducción de caminos de aumento en curso
+        self.arbol_gh = None # Árbol de Gomory–Hu mostrado sobre el grafo
+        self.disposicion = None # DisposicionFuerzas que se está refinando
 
         # Estado de interacción
         self.arrastrando = None
         self.desfase = (0,0)
+        self.paneando = None
+
+        # Vista: pantalla = mundo * zoom + desplazamiento
+        self.zoom = 1.0
+        self.vista_x, self.vista_y = 0.0, 0.0
+
+        # Escena retenida: IDs de items del canvas por nodo y por arista
+        self._items_nodo = {}    # nid -> (óvalo, texto)
+        self._items_arista = {}  # (u, v) -> {"linea", "cap", "flujo"}
+        self._incidentes_arrastre = []
+        self._repintado_pendiente = None
+        self._movimiento_pendiente = None
+        self._tam_cuadricula = None
+        self._items_arbol = {}   # i -> (línea, peso) de la arista del árbol entre i y su padre
+        self._vecinos_arbol = {} # nid -> índices de las aristas del árbol que lo tocan
         
-        # Para la funcionalidad de varios ejemplos
-        self.lista_ejemplos = []
+        # Para la funcionalidad de varios ejemplos: cada uno se genera al
+        # mostrarlo, a partir de la semilla del lote y su índice
+        self.semilla_ejemplos = None
         self.indice_ejemplo = -1
 
+        # Resultados ya calculados, por contenido de la red (ejemplos revisitados,
+        # archivos recargados, deshacer una edición)
+        self.cache = CacheFlujo()
+
         self._construir_ui()
         
         # Canvas principal para dibujar el grafo
@@ -157,9 +255,9 @@ class FlujoMaximoGUI:
         titulo.pack(fill="x", **pad)
 
         # --- Entrada de Nodo ---
-        nodo_fr = tk.LabelFrame(self.izquierda, text="Agregar Nodo (Letra)", fg=COLORES["texto"], bg=COLORES["panel"], padx=10, pady=5)
+        nodo_fr = tk.LabelFrame(self.izquierda, text="Agregar Nodo", fg=COLORES["texto"], bg=COLORES["panel"], padx=10, pady=5)
         nodo_fr.pack(fill="x", padx=12, pady=6)
-        self.nodo_id_entrada = self._crear_entrada(nodo_fr, "ID Nodo (e.g., G):")
+        self.nodo_id_entrada = self._crear_entrada(nodo_fr, "ID Nodo (e.g., G, R12, Lima):")
         tk.Button(nodo_fr, text="Agregar Nodo", command=self.agregar_nodo_click, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=6)
 
         # --- Entrada de Arista ---
@@ -168,7 +266,8 @@ class FlujoMaximoGUI:
         self.arista_u_entrada = self._crear_entrada(arista_fr, "u (Origen):")
         self.arista_v_entrada = self._crear_entrada(arista_fr, "v (Destino):")
         self.arista_c_entrada = self._crear_entrada(arista_fr, "Capacidad (c):")
-        tk.Button(arista_fr, text="Agregar Arista", command=self.agregar_arista_click, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=6)
+        tk.Button(arista_fr, text="Agregar Arista", command=self.agregar_arista_click, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=(6, 2))
+        tk.Button(arista_fr, text="Quitar Arista (u → v)", command=self.quitar_arista_click, bg="#6b7a99", fg=COLORES["texto"], activebackground="#7c8cb1", relief="flat").pack(fill="x", pady=(2, 6))
 
         # --- Origen / Destino ---
         st_fr = tk.LabelFrame(self.izquierda, text="Origen / Destino", fg=COLORES["texto"], bg=COLORES["panel"], padx=10, pady=5)
@@ -181,7 +280,24 @@ class FlujoMaximoGUI:
         # --- Ejecutar ---
         run_fr = tk.LabelFrame(self.izquierda, text="Ejecutar", fg=COLORES["texto"], bg=COLORES["panel"], padx=10, pady=5)
         run_fr.pack(fill="x", padx=12, pady=6)
-        tk.Button(run_fr, text="Ejecutar Ford–Fulkerson", command=self.ejecutar_flujo_maximo, bg="#ffcc00", fg="#121933", activebackground="#ffdd33", font=("Arial", 10, "bold"), relief="flat").pack(fill="x", pady=6)
+        tk.Label(run_fr, text="Algoritmo:", fg=COLORES["texto"], bg=COLORES["panel"]).pack(anchor="w")
+        self.algoritmo_var = tk.StringVar(value=ETIQUETAS_ALGORITMOS["ford_fulkerson"])
+        menu_alg = tk.OptionMenu(run_fr, self.algoritmo_var, *ETIQUETAS_ALGORITMOS.values())
+        menu_alg.configure(bg="#202c4b", fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, highlightthickness=0, relief="flat")
+        menu_alg.pack(fill="x", pady=2)
+        self.boton_ejecutar = tk.Button(run_fr, text="Ejecutar Flujo Máximo", command=self.ejecutar_flujo_maximo, bg="#ffcc00", fg="#121933", activebackground="#ffdd33", font=("Arial", 10, "bold"), relief="flat")
+        self.boton_ejecutar.pack(fill="x", pady=(6, 2))
+        self.boton_cancelar = tk.Button(run_fr, text="Cancelar", command=self.cancelar_calculo, bg="#6b7a99", fg=COLORES["texto"], activebackground="#7c8cb1", relief="flat", state="disabled")
+        self.boton_cancelar.pack(fill="x", pady=(2, 6))
+        self.animar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(run_fr, text="Animar caminos de aumento", variable=self.animar_var, fg=COLORES["texto"], bg=COLORES["panel"], selectcolor="#202c4b", activebackground=COLORES["panel"]).pack(anchor="w")
+        anim_fr = tk.Frame(run_fr, bg=COLORES["panel"])
+        anim_fr.pack(fill="x", pady=(2, 4))
+        tk.Button(anim_fr, text="▶", command=self.reproducir_animacion, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="left", expand=True, fill="x", padx=2)
+        tk.Button(anim_fr, text="❚❚", command=self.pausar_animacion, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="left", expand=True, fill="x", padx=2)
+        tk.Button(anim_fr, text="Paso", command=self.paso_animacion, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="left", expand=True, fill="x", padx=2)
+        tk.Button(run_fr, text="Árbol de Gomory–Hu", command=self.alternar_arbol_gomory_hu, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=(4, 2))
+        tk.Button(run_fr, text="Corte Mínimo u–v (del árbol)", command=self.consultar_corte_arbol, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=(2, 6))
 
         # --- I/O y Ejemplos ---
         io_fr = tk.LabelFrame(self.izquierda, text="I/O y Ejemplos", fg=COLORES["texto"], bg=COLORES["panel"], padx=10, pady=5)
@@ -200,11 +316,19 @@ class FlujoMaximoGUI:
         tk.Button(nav_fr, text="← Anterior", command=self.ejemplo_anterior, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="left", expand=True, fill="x", padx=2)
         tk.Button(nav_fr, text="Siguiente →", command=self.ejemplo_siguiente, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="right", expand=True, fill="x", padx=2)
         
+        disp_fr = tk.Frame(io_fr, bg=COLORES["panel"])
+        disp_fr.pack(fill="x", pady=(8, 0))
+        tk.Button(disp_fr, text="Fuerzas", command=self.disponer_fuerzas, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="left", expand=True, fill="x", padx=2)
+        tk.Button(disp_fr, text="Capas s→t", command=self.disponer_capas, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(side="right", expand=True, fill="x", padx=2)
+        tk.Button(io_fr, text="Centrar Vista", command=self.ajustar_vista, bg=BOTON_DEFAULT_BG, fg=COLORES["texto"], activebackground=BOTON_DEFAULT_ACT, relief="flat").pack(fill="x", pady=(4, 0))
         tk.Button(io_fr, text="Limpiar Todo", command=self.limpiar_todo, bg="#6b7a99", fg=COLORES["texto"], activebackground="#7c8cb1", relief="flat").pack(fill="x", pady=8)
 
         # --- Estado ---
         self.estado = tk.Label(self.izquierda, text="Listo.", fg=COLORES["texto"], bg=COLORES["panel"], anchor="w", font=("Arial", 10))
         self.estado.pack(fill="x", padx=12, pady=(10, 5))
+        # Contadores y tiempos del último cálculo
+        self.estado_detalle = tk.Label(self.izquierda, text="", fg=COLORES["texto"], bg=COLORES["panel"], anchor="w", justify="left", wraplength=270, font=("Arial", 8))
+        self.estado_detalle.pack(fill="x", padx=12, pady=(0, 5))
 
 
     def _crear_entrada(self, padre, etiqueta):
@@ -217,49 +341,86 @@ class FlujoMaximoGUI:
 
     def _vincular_eventos_canvas(self):
         if hasattr(self, 'canvas'):
-            self.canvas.bind("<Configure>", lambda e: self.redibujar())
+            self.canvas.bind("<Configure>", self._on_configure)
             self.canvas.bind("<Button-1>", self._on_click)
             self.canvas.bind("<B1-Motion>", self._on_drag)
             self.canvas.bind("<ButtonRelease-1>", self._on_release)
+            self.canvas.bind("<MouseWheel>", self._on_rueda)
+            self.canvas.bind("<Button-4>", lambda e: self._zoom_en(e.x, e.y, 1.15))
+            self.canvas.bind("<Button-5>", lambda e: self._zoom_en(e.x, e.y, 1/1.15))
 
     def agregar_nodo_click(self):
-        nid = self.nodo_id_entrada.get().strip().upper() # Convertir a mayúscula para consistencia
-        if not nid or len(nid) != 1 or not nid.isalpha():
-            messagebox.showerror("Error", "El ID del nodo debe ser una única letra (A-Z).")
+        nid = self.nodo_id_entrada.get().strip()
+        if not nid:
+            messagebox.showerror("Error", "El ID del nodo no puede estar vacío.")
             return
         if nid in self.nodos:
             messagebox.showwarning("Advertencia", f"El nodo '{nid}' ya existe.")
             return
             
         w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
-        x = random.randint(50, max(60, w-50))
-        y = random.randint(50, max(60, h-50))
+        x, y = self._a_mundo(random.randint(50, max(60, w-50)), random.randint(50, max(60, h-50)))
         
         self.nodos[nid] = {"x": x, "y": y}
+        self.tabla_nodos.agregar(nid)
+        self.indice_espacial.mover(nid, x, y)
+        self._ocultar_arbol()
         self.nodo_id_entrada.delete(0, tk.END) 
         self.redibujar()
 
     def agregar_arista_click(self):
-        u, v, c = self.arista_u_entrada.get().strip().upper(), self.arista_v_entrada.get().strip().upper(), self.arista_c_entrada.get().strip()
+        u, v, c = self._id_nodo(self.arista_u_entrada.get()), self._id_nodo(self.arista_v_entrada.get()), self.arista_c_entrada.get().strip()
         
         if u not in self.nodos or v not in self.nodos:
             messagebox.showerror("Error", "Los nodos de origen o destino no existen.")
             return
         try:
-            capacidad = float(c)
+            capacidad = convertir_capacidad(c)
             if capacidad <= 0: raise ValueError
         except:
             messagebox.showerror("Error", "La capacidad debe ser un número positivo.")
             return
             
         self.aristas.append((u, v, capacidad))
+        self.indice.agregar(u, v, capacidad)
+        self._ocultar_arbol()
         self.arista_u_entrada.delete(0, tk.END)
         self.arista_v_entrada.delete(0, tk.END)
         self.arista_c_entrada.delete(0, tk.END)
         self.redibujar()
 
+    def quitar_arista_click(self):
+        u, v = self._id_nodo(self.arista_u_entrada.get()), self._id_nodo(self.arista_v_entrada.get())
+        if not self.indice.quitar(u, v):
+            messagebox.showwarning("Advertencia", f"No existe la arista {u} → {v}.")
+            return
+        self.aristas = [a for a in self.aristas if (a[0], a[1]) != (u, v)]
+        self._ocultar_arbol()
+        self.arista_u_entrada.delete(0, tk.END)
+        self.arista_v_entrada.delete(0, tk.END)
+        self.redibujar()
+
+    def _id_nodo(self, texto):
+        # Los IDs distinguen mayúsculas; si no hay coincidencia exacta se acepta
+        # la versión en mayúsculas (compatibilidad con los nodos de una letra)
+        nid = texto.strip()
+        if nid not in self.nodos and nid.upper() in self.nodos:
+            return nid.upper()
+        return nid
+
+    def _nodos_reemplazados(self):
+        # Se cargó un conjunto de nodos nuevo: reconstruir índices y restablecer la vista
+        self.cancelar_calculo(descartar=True)
+        self._detener_animacion()
+        self._ocultar_arbol()
+        self.disposicion = None
+        self.tabla_nodos = TablaNodos(self.nodos)
+        self.indice_espacial = IndiceEspacial(self.nodos)
+        self.zoom = 1.0
+        self.vista_x, self.vista_y = 0.0, 0.0
+
     def definir_origen(self):
-        o = self.origen_entrada.get().strip().upper()
+        o = self._id_nodo(self.origen_entrada.get())
         if o in self.nodos:
             self.origen = o
             self.redibujar()
@@ -267,7 +428,7 @@ class FlujoMaximoGUI:
             messagebox.showwarning("Advertencia", f"El nodo '{o}' no existe para ser definido como origen.")
 
     def definir_destino(self):
-        d = self.destino_entrada.get().strip().upper()
+        d = self._id_nodo(self.destino_entrada.get())
         if d in self.nodos:
             self.destino = d
             self.redibujar()
@@ -275,6 +436,9 @@ class FlujoMaximoGUI:
             messagebox.showwarning("Advertencia", f"El nodo '{d}' no existe para ser definido como destino.")
 
     def ejecutar_flujo_maximo(self):
+        if self.calculo is not None:
+            return
+        self._detener_animacion()
         if not self.origen or not self.destino:
             messagebox.showerror("Error", "Debe definir un nodo Origen (s) y un Destino (t).")
             return
@@ -282,22 +446,300 @@ class FlujoMaximoGUI:
             messagebox.showerror("Error", "El Origen y el Destino no pueden ser el mismo nodo.")
             return
             
-        # Agrupar capacidades si hay aristas duplicadas
-        agg = {}
-        for u,v,c in self.aristas:
-            agg[(u,v)] = agg.get((u,v), 0.0) + c
+        # Capacidades ya agrupadas por el índice (copia: se guarda junto al flujo)
+        agg = dict(self.indice.capacidad)
         aristas_unidas = [(u,v,c) for (u,v),c in agg.items()]
 
+        etiqueta = self.algoritmo_var.get()
+        algoritmo = next(nombre for nombre, e in ETIQUETAS_ALGORITMOS.items() if e == etiqueta)
+
+        # Reanudar desde el último flujo calculado (si el grafo solo se editó)
+        previo = self.ultimo_flujo["solucion"] if self.ultimo_flujo else None
+
+        # El cálculo corre en un hilo de trabajo para no congelar la ventana;
+        # el hilo no toca Tk: la interfaz consulta su monitor con after()
+        animar = self.animar_var.get()
+        monitor = EventosFlujo() if animar else MonitorFlujo()
+        calculo = {"monitor": monitor, "etiqueta": etiqueta, "capacidad": agg, "al_terminar": self._flujo_terminado,
+                   "progreso": lambda m: f"{m.aumentos} aumentos, flujo = {m.valor}"}
+        origen, destino, tabla, cache = self.origen, self.destino, self.tabla_nodos, self.cache
+        # Con capacidades fraccionarias, repartir el flujo de la instancia
+        # reducida suma y resta en punto flotante: se resuelve sobre el grafo
+        # tal cual para que los flujos mostrados no arrastren ese redondeo
+        reducir = not animar and all(type(c) is int for c in agg.values())
+
+        def trabajo():
+            # Los caminos animados deben ser de aristas reales: sin animación se
+            # resuelve sobre la instancia reducida (sin ramas muertas ni cadenas)
+            # y los emparejamientos bipartitos con Hopcroft–Karp
+            solucion = resolver_flujo(aristas_unidas, origen, destino, algoritmo=algoritmo, previo=previo, tabla=tabla, monitor=monitor,
+                                      estadisticas=True, reducir=reducir, bipartito=False if animar else None,
+                                      cache=None if animar else cache)
+            calculo["pares"] = solucion.flujo_pares()
+            calculo["corte"] = solucion.corte_minimo()
+            calculo["solucion"] = solucion
+
+        self._lanzar_calculo(calculo, trabajo)
+
+    def _lanzar_calculo(self, calculo, trabajo):
+        # 'calculo' trae el monitor, 'progreso' (texto a partir del monitor) y
+        # 'al_terminar' (se llama en el hilo de Tk si 'trabajo' no falló)
+        calculo.update(descartar=False, error=None)
+
+        def envoltura():
+            try:
+                trabajo()
+            except Exception as e:
+                calculo["error"] = e
+
+        calculo["hilo"] = threading.Thread(target=envoltura, daemon=True)
+        self.calculo = calculo
+        self.boton_ejecutar.configure(state="disabled")
+        self.boton_cancelar.configure(state="normal")
+        self.estado["text"] = "Calculando..."
+        self.estado_detalle["text"] = ""
+        calculo["hilo"].start()
+        self.raiz.after(INTERVALO_PROGRESO, self._sondear_calculo)
+
+    def cancelar_calculo(self, descartar=False):
+        # 'descartar': el grafo se reemplazó, el resultado ya no interesa
+        if self.calculo is None:
+            return
+        self.calculo["descartar"] = self.calculo["descartar"] or descartar
+        self.calculo["monitor"].cancelar()
+        if not descartar:
+            self.estado["text"] = "Cancelando..."
+
+    def _sondear_calculo(self):
+        calculo = self.calculo
+        monitor = calculo["monitor"]
+        if calculo["hilo"].is_alive():
+            if not monitor.cancelado:
+                self.estado["text"] = f"Calculando... {calculo['progreso'](monitor)}, {monitor.transcurrido():.1f} s"
+            self.raiz.after(INTERVALO_PROGRESO, self._sondear_calculo)
+            return
+
+        self.calculo = None
+        self.boton_ejecutar.configure(state="normal")
+        self.boton_cancelar.configure(state="disabled")
+        if calculo["descartar"]:
+            return
+        error = calculo["error"]
+        if isinstance(error, CalculoCancelado):
+            self.estado["text"] = f"Cálculo cancelado ({monitor.transcurrido():.1f} s)."
+        elif isinstance(error, ValueError):
+            self.estado["text"] = "Listo."
+            messagebox.showerror("Error de Cálculo", str(error))
+        elif error is not None:
+            self.estado["text"] = "Listo."
+            messagebox.showerror("Error Inesperado", f"Ocurrió un error durante el cálculo: {error}")
+        else:
+            calculo["al_terminar"](calculo)
+
+    def _flujo_terminado(self, calculo):
+        monitor = calculo["monitor"]
+        solucion = calculo["solucion"]
+        lado_origen, aristas_corte = calculo["corte"]
+        self.ultimo_flujo = {"valor": solucion.valor, "pares": calculo["pares"], "capacidad": calculo["capacidad"], "solucion": solucion,
+                             "lado_origen": lado_origen, "corte": set(aristas_corte)}
+        if isinstance(monitor, EventosFlujo) and monitor.eventos:
+            self._iniciar_animacion(monitor, calculo["etiqueta"])
+        else:
+            self._mostrar_resultado(calculo["etiqueta"])
+
+    def _mostrar_resultado(self, etiqueta):
+        flujo_maximo = self.ultimo_flujo["valor"]
+        n_corte = len(self.ultimo_flujo["corte"])
+        solucion = self.ultimo_flujo["solucion"]
+        origen = " (desde caché)" if solucion.desde_cache else " (reanudado)" if solucion.incremental else ""
+        self.estado["text"] = f"Flujo Máximo = {flujo_maximo}{origen} | corte mínimo: {n_corte} aristas"
+        self.estado_detalle["text"] = solucion.estadisticas.resumen()
+        if solucion.reduccion is not None:
+            self.estado_detalle["text"] += " | instancia reducida: {} nodos, {} aristas".format(*solucion.reduccion)
+        if solucion.bipartito:
+            etiqueta = "Hopcroft–Karp (emparejamiento bipartito)"
+        self.redibujar()
+        messagebox.showinfo("Resultado", f"{etiqueta}\nFlujo máximo = {flujo_maximo}\nCorte mínimo: {n_corte} aristas")
+
+    # --- Árbol de Gomory–Hu ---
+    def alternar_arbol_gomory_hu(self):
+        if self.arbol_gh is not None:
+            self._ocultar_arbol()
+            self.estado["text"] = "Árbol de Gomory–Hu oculto."
+            return
+        if self.calculo is not None:
+            return
+        if len(self.nodos) < 2:
+            messagebox.showerror("Error", "Se necesitan al menos dos nodos.")
+            return
+        aristas = [(u,v,c) for (u,v),c in self.indice.capacidad.items()]
+        etiqueta = self.algoritmo_var.get()
+        algoritmo = next(nombre for nombre, e in ETIQUETAS_ALGORITMOS.items() if e == etiqueta)
+        monitor = MonitorFlujo()
+        n = len(self.tabla_nodos)
+        calculo = {"monitor": monitor, "arbol": None, "al_terminar": self._arbol_terminado,
+                   "progreso": lambda m: f"árbol de Gomory–Hu, {m.valor} de {n - 1} flujos"}
+        tabla = self.tabla_nodos
+
+        def trabajo():
+            calculo["arbol"] = arbol_gomory_hu(aristas, algoritmo=algoritmo, tabla=tabla, monitor=monitor)
+
+        self._lanzar_calculo(calculo, trabajo)
+
+    def _arbol_terminado(self, calculo):
+        arbol = self.arbol_gh = calculo["arbol"]
+        vecinos = self._vecinos_arbol = {}
+        for i, p in enumerate(arbol.padre):
+            if i != p:
+                vecinos.setdefault(arbol.nodos[i], []).append(i)
+                vecinos.setdefault(arbol.nodos[p], []).append(i)
+        self.estado["text"] = (f"Árbol de Gomory–Hu: {len(arbol.nodos) - 1} aristas "
+                               f"({calculo['monitor'].transcurrido():.1f} s). Consulte cortes u–v.")
+        self.redibujar()
+
+    def consultar_corte_arbol(self):
+        if self.arbol_gh is None:
+            messagebox.showwarning("Advertencia", "Primero calcule el árbol de Gomory–Hu.")
+            return
+        u, v = self._id_nodo(self.arista_u_entrada.get()), self._id_nodo(self.arista_v_entrada.get())
         try:
-            flujo_maximo, flujo_pares, _ = ford_fulkerson(len(self.nodos), aristas_unidas, self.origen, self.destino)
-            self.ultimo_flujo = {"valor": flujo_maximo, "pares": flujo_pares, "capacidad": agg}
-            self.estado["text"] = f"Flujo Máximo = {flujo_maximo}"
-            self.redibujar()
-            messagebox.showinfo("Resultado", f"Ford–Fulkerson (DFS)\nFlujo máximo = {flujo_maximo}")
+            valor = self.arbol_gh.corte_minimo(u, v)
+            lado = self.arbol_gh.particion(u, v)
         except ValueError as e:
-             messagebox.showerror("Error de Cálculo", str(e))
-        except Exception as e:
-            messagebox.showerror("Error Inesperado", f"Ocurrió un error durante el cálculo: {e}")
+            messagebox.showerror("Error", str(e))
+            return
+        self.estado["text"] = f"Corte mínimo {u}–{v} = {valor} (no dirigido)"
+        messagebox.showinfo("Corte Mínimo", f"Corte mínimo entre {u} y {v} = {valor}\n"
+                                            f"Lado de {u}: {len(lado)} nodos de {len(self.arbol_gh.nodos)}")
+
+    def _ocultar_arbol(self):
+        # El grafo cambió: el árbol (o su cálculo en curso) ya no vale
+        if self.calculo is not None and "arbol" in self.calculo:
+            self.cancelar_calculo(descartar=True)
+            self.estado["text"] = "Árbol de Gomory–Hu descartado: el grafo cambió."
+        if self.arbol_gh is None:
+            return
+        self.arbol_gh = None
+        self._vecinos_arbol = {}
+        for items in self._items_arbol.values():
+            self.canvas.delete(*items)
+        self._items_arbol.clear()
+
+    def _dibujar_arbol(self, x0, y0, x1, y1):
+        arbol = self.arbol_gh
+        vigentes = set()
+        if arbol is not None:
+            for i, p in enumerate(arbol.padre):
+                u, v = arbol.nodos[i], arbol.nodos[p]
+                if i == p or u not in self.nodos or v not in self.nodos:
+                    continue
+                a, b = self.nodos[u], self.nodos[v]
+                if max(a["x"], b["x"]) < x0 or min(a["x"], b["x"]) > x1 or max(a["y"], b["y"]) < y0 or min(a["y"], b["y"]) > y1:
+                    continue
+                vigentes.add(i)
+                if i not in self._items_arbol:
+                    self._items_arbol[i] = (
+                        self.canvas.create_line(0, 0, 0, 0, fill=COLORES["arbol"], width=2, dash=(4, 4), tags="arbol"),
+                        self.canvas.create_text(0, 0, text=f"{arbol.peso[i]:g}", fill=COLORES["arbol"], font=("Arial", 10, "bold"), tags="arbol"),
+                    )
+                self._colocar_arista_arbol(i)
+        for i in [i for i in self._items_arbol if i not in vigentes]:
+            self.canvas.delete(*self._items_arbol.pop(i))
+
+    def _colocar_arista_arbol(self, i):
+        arbol = self.arbol_gh
+        linea, texto = self._items_arbol[i]
+        u, v = arbol.nodos[i], arbol.nodos[arbol.padre[i]]
+        x1, y1 = self._a_pantalla(self.nodos[u]["x"], self.nodos[u]["y"])
+        x2, y2 = self._a_pantalla(self.nodos[v]["x"], self.nodos[v]["y"])
+        self.canvas.coords(linea, x1, y1, x2, y2)
+        self.canvas.coords(texto, (x1 + x2) / 2, (y1 + y2) / 2 - 10)
+        self.canvas.itemconfigure(texto, state="normal" if self.zoom >= ZOOM_ETIQUETAS else "hidden")
+
+    def _corte_visible(self):
+        # El corte se muestra con el resultado final, no durante la animación
+        return self.ultimo_flujo is not None and self.animacion is None and "corte" in self.ultimo_flujo
+
+    # --- Animación de caminos de aumento ---
+    def _iniciar_animacion(self, eventos, etiqueta):
+        # Mientras se reproduce, el canvas muestra el flujo bruto acumulado
+        # evento por evento; al terminar se vuelve al flujo neto final
+        total = len(eventos.eventos)
+        pares = dict.fromkeys(self.ultimo_flujo["capacidad"], 0)
+        pares.update(eventos.inicial)
+        self.animacion = {"eventos": eventos.eventos, "pos": 0, "pausada": False, "pendiente": None,
+                          "final": self.ultimo_flujo["pares"], "etiqueta": etiqueta, "resaltadas": set(),
+                          "por_cuadro": max(1, -(-total * CUADRO_MIN // DURACION_ANIMACION)),
+                          "ms": max(CUADRO_MIN, min(500, DURACION_ANIMACION // total))}
+        self.ultimo_flujo["pares"] = pares
+        self.estado["text"] = f"Reproduciendo {total} caminos de aumento..."
+        self.redibujar()
+        self.reproducir_animacion()
+
+    def reproducir_animacion(self):
+        anim = self.animacion
+        if anim is None:
+            return
+        anim["pausada"] = False
+        if anim["pendiente"] is None:
+            anim["pendiente"] = self.raiz.after(anim["ms"], self._cuadro_animacion)
+
+    def pausar_animacion(self):
+        if self.animacion is not None:
+            self.animacion["pausada"] = True
+
+    def paso_animacion(self):
+        if self.animacion is not None:
+            self.animacion["pausada"] = True
+            self._aplicar_eventos(1)
+
+    def _cuadro_animacion(self):
+        anim = self.animacion
+        if anim is None:
+            return
+        anim["pendiente"] = None
+        if anim["pausada"]:
+            return
+        # En corridas largas se aplican varios eventos por cuadro
+        self._aplicar_eventos(anim["por_cuadro"])
+        if self.animacion is anim:
+            anim["pendiente"] = self.raiz.after(anim["ms"], self._cuadro_animacion)
+
+    def _aplicar_eventos(self, cantidad):
+        anim = self.animacion
+        pares = self.ultimo_flujo["pares"]
+        tocadas = set(anim["resaltadas"])
+        eventos = anim["eventos"][anim["pos"]:anim["pos"] + cantidad]
+        for evento in eventos:
+            for par, delta in evento["deltas"]:
+                pares[par] = pares.get(par, 0) + delta
+                tocadas.add(par)
+        anim["pos"] += len(eventos)
+        anim["resaltadas"] = {par for par, _ in eventos[-1]["deltas"]}
+
+        # Solo se actualizan los items de las aristas afectadas (y visibles)
+        for par in tocadas:
+            if par in self._items_arista and par in self.indice.capacidad:
+                self._actualizar_arista(par[0], par[1], self.indice.capacidad[par])
+        self.canvas.tag_raise("etiqueta")
+        self.canvas.tag_raise("nodo")
+
+        ultimo = eventos[-1]
+        self.estado["text"] = (f"Camino {anim['pos']}/{len(anim['eventos'])}: {' → '.join(map(str, ultimo['camino']))} "
+                               f"(+{ultimo['cuello']}), flujo = {ultimo['valor']}")
+        if anim["pos"] >= len(anim["eventos"]):
+            self._detener_animacion()
+            self._mostrar_resultado(anim["etiqueta"])
+
+    def _detener_animacion(self):
+        # Terminar la reproducción dejando el flujo final en el canvas
+        anim = self.animacion
+        if anim is None:
+            return
+        self.animacion = None
+        if self.ultimo_flujo is not None:
+            self.ultimo_flujo["pares"] = anim["final"]
+        self.redibujar()
 
 
     def _generar_layout_circular(self, n_nodos):
@@ -307,7 +749,7 @@ class FlujoMaximoGUI:
         radius = min(w, h) / 2.5 # Radio para que se ajuste bien
         
         nodos_coords = {}
-        letras = string.ascii_uppercase[:n_nodos]
+        letras = _nombres_nodos(n_nodos)
         
         for i, nid in enumerate(letras):
             # Calcular ángulo para posicionar nodos uniformemente en un círculo
@@ -326,6 +768,7 @@ class FlujoMaximoGUI:
         
         # 1. Generar layout circular y obtener IDs con letras
         self.nodos, self.origen, self.destino = self._generar_layout_circular(n)
+        self._nodos_reemplazados()
         letras = list(self.nodos.keys())
         
         aristas = []
@@ -350,9 +793,10 @@ class FlujoMaximoGUI:
         # Agrupar capacidades si hay aristas duplicadas
         agg = {}
         for u,v,c in aristas:
-            agg[(u,v)] = agg.get((u,v), 0.0) + c
+            agg[(u,v)] = agg.get((u,v), 0) + c
         
         self.aristas = [(u,v,c) for (u,v),c in agg.items()]
+        self.indice = IndiceAristas(self.aristas)
         
         self.origen_entrada.delete(0, tk.END)
         self.origen_entrada.insert(0, self.origen)
@@ -363,55 +807,55 @@ class FlujoMaximoGUI:
         self.redibujar()
 
     def cargar_varios_ejemplos(self):
-        self.lista_ejemplos = []
+        # Solo se elige la semilla: los ejemplos se generan al navegar
+        self.semilla_ejemplos = random.getrandbits(32)
+        self.indice_ejemplo = 0
+        self._cargar_ejemplo_desde_lista()
+        self.estado["text"] = f"Ejemplo 1 de {CANTIDAD_EJEMPLOS} cargado. Presiona Ejecutar."
+
+    def _generar_ejemplo(self, indice):
+        # Mismo índice y semilla, mismo ejemplo: al volver a él la caché ya tiene su flujo
+        rng = random.Random(f"{self.semilla_ejemplos}:{indice}")
+        n = rng.randint(5, 7)
         
-        for _ in range(5):
-            n = random.randint(5, 7)
-            
-            nodos_coords, origen, destino = self._generar_layout_circular(n)
-            letras = list(nodos_coords.keys())
-            
-            aristas = []
-            
-            # 1. Garantizar una ruta de A al último nodo
-            for i in range(n - 1):
-                u, v = letras[i], letras[i + 1]
-                capacidad = random.randint(10, 30) 
-                aristas.append((u, v, capacidad))
-            
-            # 2. Agregar aristas aleatorias adicionales
-            for i in range(n):
-                for j in range(n):
-                    u, v = letras[i], letras[j]
-                    if u != v and random.random() < 0.4:
-                        if (u, v) not in [(letras[k], letras[k+1]) for k in range(n-1)]:
-                            capacidad = random.randint(5, 20)
-                            aristas.append((u, v, capacidad))
-                            
-            # Agrupar capacidades si hay aristas duplicadas
-            agg = {}
-            for u,v,c in aristas:
-                agg[(u,v)] = agg.get((u,v), 0.0) + c
-            
-            unique_aristas = [(u,v,c) for (u,v),c in agg.items()]
-            
-            ejemplo = {"nodos": nodos_coords, "aristas": unique_aristas, "origen": origen, "destino": destino}
-            self.lista_ejemplos.append(ejemplo)
-            
-        if self.lista_ejemplos:
-            self.indice_ejemplo = 0
-            self._cargar_ejemplo_desde_lista()
-            self.estado["text"] = f"Ejemplo 1 de {len(self.lista_ejemplos)} cargado. Presiona Ejecutar."
-        else:
-             self.estado["text"] = "No se pudieron generar ejemplos."
+        nodos_coords, origen, destino = self._generar_layout_circular(n)
+        letras = list(nodos_coords.keys())
+        
+        aristas = []
+        
+        # 1. Garantizar una ruta de A al último nodo
+        for i in range(n - 1):
+            u, v = letras[i], letras[i + 1]
+            capacidad = rng.randint(10, 30) 
+            aristas.append((u, v, capacidad))
+        
+        # 2. Agregar aristas aleatorias adicionales
+        for i in range(n):
+            for j in range(n):
+                u, v = letras[i], letras[j]
+                if u != v and rng.random() < 0.4:
+                    if (u, v) not in [(letras[k], letras[k+1]) for k in range(n-1)]:
+                        capacidad = rng.randint(5, 20)
+                        aristas.append((u, v, capacidad))
+                        
+        # Agrupar capacidades si hay aristas duplicadas
+        agg = {}
+        for u,v,c in aristas:
+            agg[(u,v)] = agg.get((u,v), 0) + c
+        
+        unique_aristas = [(u,v,c) for (u,v),c in agg.items()]
+        
+        return {"nodos": nodos_coords, "aristas": unique_aristas, "origen": origen, "destino": destino}
 
     def _cargar_ejemplo_desde_lista(self):
         self.ultimo_flujo = None
-        if not self.lista_ejemplos: return
+        if self.semilla_ejemplos is None: return
         
-        ejemplo = self.lista_ejemplos[self.indice_ejemplo]
+        ejemplo = self._generar_ejemplo(self.indice_ejemplo)
         self.nodos = ejemplo["nodos"]
+        self._nodos_reemplazados()
         self.aristas = ejemplo["aristas"]
+        self.indice = IndiceAristas(self.aristas)
         self.origen = ejemplo["origen"]
         self.destino = ejemplo["destino"]
         
@@ -423,16 +867,16 @@ class FlujoMaximoGUI:
         self.redibujar()
 
     def ejemplo_anterior(self):
-        if hasattr(self, "lista_ejemplos") and self.indice_ejemplo > 0:
+        if self.semilla_ejemplos is not None and self.indice_ejemplo > 0:
             self.indice_ejemplo -= 1
             self._cargar_ejemplo_desde_lista()
-            self.estado["text"] = f"Ejemplo {self.indice_ejemplo+1} de {len(self.lista_ejemplos)} cargado."
+            self.estado["text"] = f"Ejemplo {self.indice_ejemplo+1} de {CANTIDAD_EJEMPLOS} cargado."
 
     def ejemplo_siguiente(self):
-        if hasattr(self, "lista_ejemplos") and self.indice_ejemplo < len(self.lista_ejemplos)-1:
+        if self.semilla_ejemplos is not None and self.indice_ejemplo < CANTIDAD_EJEMPLOS-1:
             self.indice_ejemplo += 1
             self._cargar_ejemplo_desde_lista()
-            self.estado["text"] = f"Ejemplo {self.indice_ejemplo+1} de {len(self.lista_ejemplos)} cargado."
+            self.estado["text"] = f"Ejemplo {self.indice_ejemplo+1} de {CANTIDAD_EJEMPLOS} cargado."
 
     def cargar_ejemplo(self):
         self.limpiar_todo(confirmar=False)
@@ -450,6 +894,7 @@ class FlujoMaximoGUI:
         self.nodos["F"] = {"x": center_x + 200, "y": center_y}
 
         self.origen, self.destino = "A", "F" # A=s, F=t
+        self._nodos_reemplazados()
         
         # Aristas que replican el ejemplo de la imagen (aunque con un par de cambios para mostrar bidireccionalidad)
         ejemplo = [
@@ -468,9 +913,10 @@ class FlujoMaximoGUI:
         # Agrupar capacidades si hay aristas duplicadas
         agg = {}
         for u,v,c in ejemplo:
-            agg[(u,v)] = agg.get((u,v), 0.0) + c
+            agg[(u,v)] = agg.get((u,v), 0) + c
         
         self.aristas = [(u,v,c) for (u,v),c in agg.items()]
+        self.indice = IndiceAristas(self.aristas)
         
         self.origen_entrada.delete(0, tk.END)
         self.origen_entrada.insert(0, self.origen)
@@ -501,10 +947,29 @@ class FlujoMaximoGUI:
                 with open(ruta, "r", encoding="utf-8") as f:
                     datos = json.load(f)
                     
-                self.nodos = datos.get("nodos", {})
-                # Asegurar que la capacidad se carga como float
-                self.aristas = [(u,v,float(c)) for u,v,c in datos.get("aristas", [])]
+                # Las claves JSON siempre son texto: normalizar también los IDs de aristas y s/t.
+                # Los nodos pueden venir sin coordenadas (o ser solo una lista de IDs, o
+                # faltar): esos se ubican con la disposición por capas
+                nodos = datos.get("nodos") or {}
+                if isinstance(nodos, list):
+                    nodos = dict.fromkeys(nodos)
+                self.nodos = {str(nid): pos for nid, pos in nodos.items()}
+                # Capacidades enteras como int (aritmética exacta), el resto como float
+                self.aristas = [(str(u),str(v),convertir_capacidad(c)) for u,v,c in datos.get("aristas", [])]
                 self.origen, self.destino = datos.get("origen"), datos.get("destino")
+                self.origen = None if self.origen is None else str(self.origen)
+                self.destino = None if self.destino is None else str(self.destino)
+                for u,v,_ in self.aristas:
+                    self.nodos.setdefault(u, None)
+                    self.nodos.setdefault(v, None)
+                sin_posicion = [nid for nid, pos in self.nodos.items() if not pos or "x" not in pos or "y" not in pos]
+                if sin_posicion:
+                    w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+                    capas = disposicion_capas(self.nodos, [(u,v) for u,v,_ in self.aristas], self.origen, self.destino, max(w, 400), max(h, 300))
+                    for nid in sin_posicion:
+                        self.nodos[nid] = {"x": capas[nid][0], "y": capas[nid][1]}
+                self._nodos_reemplazados()
+                self.indice = IndiceAristas(self.aristas)
                 self.ultimo_flujo = None
                 
                 self.origen_entrada.delete(0, tk.END)
@@ -513,6 +978,9 @@ class FlujoMaximoGUI:
                 if self.destino: self.destino_entrada.insert(0, self.destino)
                 
                 self.estado["text"] = f"Grafo cargado desde {ruta.split('/')[-1]}."
+                if sin_posicion:
+                    self.estado["text"] += f" {len(sin_posicion)} nodos sin coordenadas, ubicados por capas."
+                    self.ajustar_vista()
                 self.redibujar()
             except Exception as e:
                  messagebox.showerror("Error de Carga", f"No se pudo cargar el archivo o el formato es incorrecto: {e}")
@@ -521,10 +989,12 @@ class FlujoMaximoGUI:
         if confirmar and not messagebox.askyesno("Confirmar", "¿Limpiar todo el grafo (nodos, aristas y flujo)?"):
             return
         self.nodos.clear()
+        self._nodos_reemplazados()
         self.aristas.clear()
+        self.indice = IndiceAristas()
         self.origen, self.destino = None, None
         self.ultimo_flujo = None
-        self.lista_ejemplos = []
+        self.semilla_ejemplos = None
         self.indice_ejemplo = -1
         
         self.origen_entrada.delete(0, tk.END)
@@ -533,79 +1003,318 @@ class FlujoMaximoGUI:
         self.estado["text"] = "Grafo limpio. Comience a agregar nodos."
         self.redibujar()
 
+    # --- Disposición automática ---
+    def disponer_capas(self):
+        if not self.nodos:
+            return
+        self.disposicion = None
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        posiciones = disposicion_capas(self.nodos, self.indice.capacidad, self.origen, self.destino, max(w, 400), max(h, 300))
+        self._aplicar_posiciones(posiciones)
+        self.estado["text"] = "Nodos dispuestos en capas según su distancia desde el origen."
+
+    def disponer_fuerzas(self):
+        if len(self.nodos) < 2:
+            return
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        actuales = {nid: (pos["x"], pos["y"]) for nid, pos in self.nodos.items()}
+        disposicion = self.disposicion = DisposicionFuerzas(self.nodos, self.indice.capacidad, actuales, max(w, 400), max(h, 300))
+        self.ajustar_vista()
+        self.raiz.after(INTERVALO_DISPOSICION, self._paso_disposicion, disposicion)
+
+    def _paso_disposicion(self, disposicion):
+        # Cada paso calcula un rato y muestra el estado: el dibujo se refina a la
+        # vista. Entre pasos solo se reubican los items de lo que se movió; la
+        # vista (zoom y desplazamiento) se reencaja al terminar
+        if disposicion is not self.disposicion:
+            return  # se reemplazó el grafo, se arrastró un nodo o empezó otra disposición
+        terminado = disposicion.paso(PRESUPUESTO_DISPOSICION)
+        if terminado:
+            self.disposicion = None
+            self._aplicar_posiciones(disposicion.posiciones)
+            self.estado["text"] = "Disposición por fuerzas terminada."
+        else:
+            self._colocar_movidos(self._mover_nodos(disposicion.posiciones))
+            self.estado["text"] = f"Disponiendo por fuerzas... iteración {disposicion.iteracion} de {disposicion.iteraciones}"
+            self.raiz.after(INTERVALO_DISPOSICION, self._paso_disposicion, disposicion)
+
+    def _aplicar_posiciones(self, posiciones):
+        self._mover_nodos(posiciones)
+        self.ajustar_vista()
+
+    def _mover_nodos(self, posiciones):
+        # Cambia las posiciones y el índice espacial; devuelve los nodos que se movieron
+        movidos = []
+        for nid, (x, y) in posiciones.items():
+            pos = self.nodos.get(nid)
+            if pos is not None and (pos["x"] != x or pos["y"] != y):
+                pos["x"], pos["y"] = x, y
+                self.indice_espacial.mover(nid, x, y)
+                movidos.append(nid)
+        return movidos
+
+    # --- Vista (zoom y desplazamiento) ---
+    def _a_pantalla(self, x, y):
+        return x * self.zoom + self.vista_x, y * self.zoom + self.vista_y
+
+    def _a_mundo(self, x, y):
+        return (x - self.vista_x) / self.zoom, (y - self.vista_y) / self.zoom
+
+    def _rect_visible(self, margen=0):
+        # Región visible del canvas en coordenadas del mundo
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        x0, y0 = self._a_mundo(0, 0)
+        x1, y1 = self._a_mundo(w, h)
+        return x0 - margen, y0 - margen, x1 + margen, y1 + margen
+
+    def _on_rueda(self, e):
+        self._zoom_en(e.x, e.y, 1.15 if e.delta > 0 else 1/1.15)
+
+    def _zoom_en(self, x, y, factor):
+        # Mantener fijo el punto del mundo que está bajo el cursor
+        zoom = max(ZOOM_MIN, min(ZOOM_MAX, self.zoom * factor))
+        wx, wy = self._a_mundo(x, y)
+        self.zoom = zoom
+        self.vista_x, self.vista_y = x - wx * zoom, y - wy * zoom
+        self.redibujar()
+
+    def ajustar_vista(self):
+        # Encajar todos los nodos en el canvas
+        if not self.nodos:
+            return
+        xs = [p["x"] for p in self.nodos.values()]
+        ys = [p["y"] for p in self.nodos.values()]
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        ancho = max(xs) - min(xs) + 4 * RADIO_NODO
+        alto = max(ys) - min(ys) + 4 * RADIO_NODO
+        self.zoom = max(ZOOM_MIN, min(ZOOM_MAX, min(w / ancho, h / alto)))
+        self.vista_x = w / 2 - (min(xs) + max(xs)) / 2 * self.zoom
+        self.vista_y = h / 2 - (min(ys) + max(ys)) / 2 * self.zoom
+        self.redibujar()
+
     # --- Interacción de Arrastre ---
+    def _nodo_en(self, x, y):
+        # Nodo bajo el punto (x, y) de la pantalla, consultando el índice espacial
+        wx, wy = self._a_mundo(x, y)
+        for nid in self.indice_espacial.en_rectangulo(wx - RADIO_NODO, wy - RADIO_NODO, wx + RADIO_NODO, wy + RADIO_NODO):
+            pos = self.nodos[nid]
+            if (pos["x"]-wx)**2 + (pos["y"]-wy)**2 <= RADIO_NODO**2:
+                return nid
+        return None
+
     def _on_click(self, e):
-        for nid, pos in self.nodos.items():
-            if (pos["x"]-e.x)**2 + (pos["y"]-e.y)**2 <= RADIO_NODO**2:
-                self.arrastrando, self.desfase = nid, (pos["x"]-e.x, pos["y"]-e.y)
-                return
+        nid = self._nodo_en(e.x, e.y)
+        if nid is not None:
+            pos = self.nodos[nid]
+            wx, wy = self._a_mundo(e.x, e.y)
+            self.arrastrando, self.desfase = nid, (pos["x"]-wx, pos["y"]-wy)
+            # Solo las aristas incidentes se mueven con el nodo
+            self._incidentes_arrastre = self.indice.incidentes_a(nid)
+            # Mover un nodo a mano detiene la disposición automática
+            self.disposicion = None
+            return
+        # Arrastrar sobre el fondo desplaza la vista
         self.arrastrando = None
+        self.paneando = (e.x, e.y, self.vista_x, self.vista_y)
 
     def _on_drag(self, e):
         if self.arrastrando:
-            self.nodos[self.arrastrando]["x"] = e.x + self.desfase[0]
-            self.nodos[self.arrastrando]["y"] = e.y + self.desfase[1]
-            w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
-            self.nodos[self.arrastrando]["x"] = max(RADIO_NODO, min(w - RADIO_NODO, self.nodos[self.arrastrando]["x"]))
-            self.nodos[self.arrastrando]["y"] = max(RADIO_NODO, min(h - RADIO_NODO, self.nodos[self.arrastrando]["y"]))
+            wx, wy = self._a_mundo(e.x, e.y)
+            x0, y0, x1, y1 = self._rect_visible(-RADIO_NODO)
+            pos = self.nodos[self.arrastrando]
+            pos["x"] = max(x0, min(x1, wx + self.desfase[0]))
+            pos["y"] = max(y0, min(y1, wy + self.desfase[1]))
+            self.indice_espacial.mover(self.arrastrando, pos["x"], pos["y"])
+            # Una ráfaga de eventos de movimiento produce un solo repintado
+            if self._movimiento_pendiente is None:
+                self._movimiento_pendiente = self.raiz.after_idle(self._aplicar_movimiento)
+        elif self.paneando:
+            x0, y0, vx, vy = self.paneando
+            self.vista_x, self.vista_y = vx + e.x - x0, vy + e.y - y0
             self.redibujar()
 
     def _on_release(self, e):
         self.arrastrando = None
+        self.paneando = None
+
+    def _aplicar_movimiento(self):
+        self._movimiento_pendiente = None
+        if self.arrastrando is None or self.arrastrando not in self._items_nodo:
+            return
+        self._colocar_movidos([self.arrastrando], self._incidentes_arrastre)
+
+    def _colocar_movidos(self, movidos, incidentes=None):
+        # Reubicar solo los items de los nodos movidos, de sus aristas y de las
+        # del árbol; los nodos que entran a la vista o salen de ella ganan o
+        # pierden sus items (las aristas que quedaron afuera se quitan en el
+        # próximo repintado completo)
+        x0, y0, x1, y1 = self._rect_visible(RADIO_NODO)
+        for nid in movidos:
+            pos = self.nodos[nid]
+            if x0 <= pos["x"] <= x1 and y0 <= pos["y"] <= y1:
+                if nid in self._items_nodo:
+                    self._colocar_nodo(nid)
+                else:
+                    self._actualizar_nodo(nid, self._color_nodo(nid))
+            elif nid in self._items_nodo:
+                self.canvas.delete(*self._items_nodo.pop(nid))
+        if incidentes is None:
+            incidentes = {par for nid in movidos for par in self.indice.incidentes_a(nid)}
+        for u, v in incidentes:
+            if (u, v) in self._items_arista:
+                self._colocar_arista(u, v)
+            elif (u, v) in self.indice.capacidad and (u in self._items_nodo or v in self._items_nodo):
+                # La arista estaba fuera de la vista y ahora toca un nodo visible
+                self._actualizar_arista(u, v, self.indice.capacidad[(u, v)])
+        for i in {i for nid in movidos for i in self._vecinos_arbol.get(nid, ())}:
+            if i in self._items_arbol:
+                self._colocar_arista_arbol(i)
+        self.canvas.tag_raise("etiqueta")
+        self.canvas.tag_raise("nodo")
     # -------------------------------
 
+    def _on_configure(self, e):
+        # La cuadrícula solo se redibuja cuando cambia el tamaño del canvas
+        tam = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        if tam != self._tam_cuadricula:
+            self._tam_cuadricula = tam
+            self._dibujar_cuadricula()
+            self.redibujar()
+
     def redibujar(self):
-        self.canvas.delete("all")
-        self._dibujar_cuadricula()
-        
-        # Dibujar aristas (líneas y capacidad)
-        for (u,v,cap) in self._aristas_agrupadas():
-            self._dibujar_arista_linea(u,v,cap)
-            
-        # Dibujar flujo y capacidad sobre las aristas
-        if self.ultimo_flujo:
-            for (u,v), f in self.ultimo_flujo["pares"].items():
-                cap = self.ultimo_flujo["capacidad"].get((u,v), 0.0)
-                if cap > 0:
-                    self._dibujar_flujo_texto(u,v,f,cap)
-                    
-        # Dibujar nodos
-        for nid in self.nodos:
-            color = COLORES["nodo"]
-            if nid == self.origen: color = COLORES["nodo_origen"]
-            elif nid == self.destino: color = COLORES["nodo_destino"]
-            self._dibujar_nodo(nid,color)
+        # Agrupar pedidos de repintado: varios cambios seguidos se pintan una vez
+        if self._repintado_pendiente is None:
+            self._repintado_pendiente = self.raiz.after_idle(self._repintar)
+
+    def _repintar(self):
+        self._repintado_pendiente = None
+
+        # Solo se crean items para lo que toca la región visible
+        x0, y0, x1, y1 = self._rect_visible(RADIO_NODO)
+        visibles = set()
+        for nid in self.indice_espacial.en_rectangulo(x0, y0, x1, y1):
+            pos = self.nodos[nid]
+            if x0 <= pos["x"] <= x1 and y0 <= pos["y"] <= y1:
+                visibles.add(nid)
+
+        # Aristas (línea, capacidad y flujo): crear, actualizar o quitar items
+        vigentes = set()
+        for (u,v),cap in self.indice.capacidad.items():
+            if u not in self.nodos or v not in self.nodos:
+                continue
+            if u not in visibles and v not in visibles:
+                a, b = self.nodos[u], self.nodos[v]
+                if max(a["x"], b["x"]) < x0 or min(a["x"], b["x"]) > x1 or max(a["y"], b["y"]) < y0 or min(a["y"], b["y"]) > y1:
+                    continue
+            vigentes.add((u,v))
+            self._actualizar_arista(u,v,cap)
+        for par in [p for p in self._items_arista if p not in vigentes]:
+            self._borrar_arista(par)
+
+        # Nodos
+        for nid in visibles:
+            self._actualizar_nodo(nid, self._color_nodo(nid))
+        for nid in [n for n in self._items_nodo if n not in visibles]:
+            self.canvas.delete(*self._items_nodo.pop(nid))
+
+        self._dibujar_arbol(x0, y0, x1, y1)
+
+        # Orden de apilado: cuadrícula < aristas < árbol < etiquetas < nodos
+        self.canvas.tag_raise("arbol")
+        self.canvas.tag_raise("etiqueta")
+        self.canvas.tag_raise("nodo")
 
     def _dibujar_cuadricula(self):
+        self.canvas.delete("grid")
         w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
         for x in range(0, w, 40):
             self.canvas.create_line(x, 0, x, h, fill=COLORES["cuadricula"], tags="grid")
         for y in range(0, h, 40):
             self.canvas.create_line(0, y, w, y, fill=COLORES["cuadricula"], tags="grid")
+        self.canvas.tag_lower("grid")
+
+    def _color_nodo(self, nid):
+        if nid == self.origen:
+            return COLORES["nodo_origen"]
+        if nid == self.destino:
+            return COLORES["nodo_destino"]
+        return COLORES["nodo"]
+
+    def _actualizar_nodo(self, nid, color):
+        items = self._items_nodo.get(nid)
+        if items is None:
+            oval = self.canvas.create_oval(0, 0, 0, 0, outline="", tags="nodo")
+            texto = self.canvas.create_text(0, 0, text=_etiqueta_nodo(nid), fill=COLORES["texto"], font=("Arial", 11 if len(str(nid)) <= 2 else 8, "bold"), tags="nodo")
+            items = self._items_nodo[nid] = (oval, texto)
+        # Con un corte calculado, el borde indica el lado del nodo
+        borde, ancho = "", 1
+        if self._corte_visible():
+            borde = COLORES["lado_origen"] if nid in self.ultimo_flujo["lado_origen"] else COLORES["lado_destino"]
+            ancho = 3
+        self.canvas.itemconfigure(items[0], fill=color, outline=borde, width=ancho)
+        self._colocar_nodo(nid)
+
+    def _colocar_nodo(self, nid):
+        x, y = self._a_pantalla(self.nodos[nid]["x"], self.nodos[nid]["y"])
+        r = RADIO_NODO * self.zoom
+        oval, texto = self._items_nodo[nid]
+        self.canvas.coords(oval, x-r, y-r, x+r, y+r)
+        self.canvas.coords(texto, x, y)
+        self.canvas.itemconfigure(texto, state="normal" if self.zoom >= ZOOM_ETIQUETAS else "hidden")
+
+    def _actualizar_arista(self, u, v, cap):
+        items = self._items_arista.get((u,v))
+        if items is None:
+            items = self._items_arista[(u,v)] = {
+                "linea": self.canvas.create_line(0, 0, 0, 0, arrow=tk.LAST, arrowshape=(TAM_FLECHA, TAM_FLECHA, TAM_FLECHA/2), tags="arista"),
+                "cap": self.canvas.create_text(0, 0, fill=COLORES["texto"], font=("Arial",10, "bold"), tags="etiqueta"),
+                "flujo": None,
+            }
 
-    def _dibujar_nodo(self, nid, color):
-        x, y = self.nodos[nid]["x"], self.nodos[nid]["y"]
-        self.canvas.create_oval(x-RADIO_NODO, y-RADIO_NODO, x+RADIO_NODO, y+RADIO_NODO, fill=color, outline="", tags=nid)
-        self.canvas.create_text(x, y, text=str(nid), fill=COLORES["texto"], font=("Arial", 11, "bold"), tags=nid)
-
-    def _aristas_agrupadas(self):
-        # Agrupa aristas por (u, v) y suma sus capacidades
-        agg = {}
-        for u,v,c in self.aristas:
-            agg[(u,v)] = agg.get((u,v),0.0)+float(c)
-        return [(u,v,c) for (u,v),c in agg.items()]
+        # Resaltar si la arista está saturada
+        color=COLORES["arista"]; ancho=2
+        flujo_actual = self.ultimo_flujo["pares"].get((u,v), 0.0) if self.ultimo_flujo else 0.0
+        if cap > 0 and abs(flujo_actual - cap) < 1e-9: 
+            color=COLORES["arista_sat"]; ancho=3
+        trazo = ()
+        if self.animacion is not None and (u,v) in self.animacion["resaltadas"]:
+            color=COLORES["arista_camino"]; ancho=4
+        elif self._corte_visible() and (u,v) in self.ultimo_flujo["corte"]:
+            color=COLORES["arista_corte"]; ancho=4; trazo=(8, 4)
+        self.canvas.itemconfigure(items["linea"], fill=color, width=ancho, dash=trazo)
+        self.canvas.itemconfigure(items["cap"], text=str(int(cap)))
+
+        # Texto de flujo: solo si hay un flujo calculado para esta arista
+        cap_flujo = self.ultimo_flujo["capacidad"].get((u,v), 0.0) if self.ultimo_flujo else 0.0
+        if self.ultimo_flujo and (u,v) in self.ultimo_flujo["pares"] and cap_flujo > 0:
+            if items["flujo"] is None:
+                items["flujo"] = self.canvas.create_text(0, 0, fill=COLORES["arista_flujo_texto"], font=("Arial",11,"bold"), 
+                                                         anchor="center", justify="center", tags="etiqueta")
+            self.canvas.itemconfigure(items["flujo"], text=f"{int(self.ultimo_flujo['pares'][(u,v)])}")
+        elif items["flujo"] is not None:
+            self.canvas.delete(items["flujo"])
+            items["flujo"] = None
+
+        self._colocar_arista(u, v)
+
+    def _borrar_arista(self, par):
+        items = self._items_arista.pop(par)
+        self.canvas.delete(items["linea"], items["cap"])
+        if items["flujo"] is not None:
+            self.canvas.delete(items["flujo"])
+
+    def _colocar_arista(self, u, v):
+        # Recalcular solo las coordenadas de los items de la arista
+        items = self._items_arista[(u,v)]
 
-    def _dibujar_arista_linea(self, u,v,cap):
-        if u not in self.nodos or v not in self.nodos: return
-        
         # Verificar si existe la arista opuesta (v -> u)
-        existe_opuesta = any(a[0] == v and a[1] == u for a in self.aristas)
+        existe_opuesta = self.indice.tiene_opuesta(u, v)
         
         # Determinar el desplazamiento: 0 si es unidireccional, ESPACIO_ARISTA si es bidireccional
-        desplazamiento = ESPACIO_ARISTA / 2 if existe_opuesta else 0
+        desplazamiento = ESPACIO_ARISTA / 2 * self.zoom if existe_opuesta else 0
 
-        x1,y1=self.nodos[u]["x"],self.nodos[u]["y"]
-        x2,y2=self.nodos[v]["x"],self.nodos[v]["y"]
+        x1,y1=self._a_pantalla(self.nodos[u]["x"],self.nodos[u]["y"])
+        x2,y2=self._a_pantalla(self.nodos[v]["x"],self.nodos[v]["y"])
         dx,dy=x2-x1,y2-y1; dist=math.hypot(dx,dy) or 1
         
         # Vector unitario y normal (perpendicular)
@@ -617,74 +1326,25 @@ class FlujoMaximoGUI:
         x2_disp, y2_disp = x2 + nx * desplazamiento, y2 + ny * desplazamiento
 
         # Ajustar los puntos de inicio y fin para que no toquen el centro del nodo
-        offset = RADIO_NODO + 2
+        offset = RADIO_NODO * self.zoom + 2
         x1_adj, y1_adj = x1_disp + ux * offset, y1_disp + uy * offset
         x2_adj, y2_adj = x2_disp - ux * offset, y2_disp - uy * offset
+        self.canvas.coords(items["linea"], x1_adj, y1_adj, x2_adj, y2_adj)
         
-        # Dibujar la línea de la arista
-        color=COLORES["arista"]; ancho=2
-        flujo_actual = self.ultimo_flujo["pares"].get((u,v), 0.0) if self.ultimo_flujo else 0.0
-        
-        # Resaltar si la arista está saturada
-        if cap > 0 and abs(flujo_actual - cap) < 1e-9: 
-            color=COLORES["arista_sat"]; ancho=3
-            
-        self.canvas.create_line(x1_adj, y1_adj, x2_adj, y2_adj, fill=color, width=ancho, 
-                                arrow=tk.LAST, arrowshape=(TAM_FLECHA, TAM_FLECHA, TAM_FLECHA/2), tags=f"arista_{u}_{v}")
-        
-        # Posición para el texto de capacidad
+        # Posición para los textos: capacidad a un lado de la línea, flujo al otro
         mx,my=(x1_adj+x2_adj)/2,(y1_adj+y2_adj)/2
-        
-        # Desplazamiento del texto paralelo a la línea (lejos del centro)
-        perp_dx, perp_dy = -uy, ux # Vector perpendicular (normal) al vector de arista
-        
-        # Desplazar texto de capacidad aún más lejos para evitar superposición con el flujo
-        cap_offset = 20 if existe_opuesta else 10 
-        cap_x, cap_y = mx + nx * cap_offset, my + ny * cap_offset 
-        
-        self.canvas.create_text(cap_x, cap_y, text=str(int(cap)), fill=COLORES["texto"], font=("Arial",10, "bold"), tags=f"cap_text_{u}_{v}")
+        texto_offset = 20 if existe_opuesta else 10 
+        self.canvas.coords(items["cap"], mx + nx * texto_offset, my + ny * texto_offset)
+        if items["flujo"] is not None:
+            self.canvas.coords(items["flujo"], mx - nx * texto_offset, my - ny * texto_offset)
 
-    def _dibujar_flujo_texto(self,u,v,f,c):
-        if u not in self.nodos or v not in self.nodos: return
-        
-        # Verificar si existe la arista opuesta (v -> u)
-        existe_opuesta = any(a[0] == v and a[1] == u for a in self.aristas)
-
-        # Determinar el desplazamiento de la arista
-        desplazamiento = ESPACIO_ARISTA / 2 if existe_opuesta else 0
-
-        x1,y1=self.nodos[u]["x"],self.nodos[u]["y"]
-        x2,y2=self.nodos[v]["x"],self.nodos[v]["y"]
-        dx,dy=x2-x1,y2-y1; dist=math.hypot(dx,dy) or 1
-        
-        # Vector unitario y normal (perpendicular)
-        ux,uy=dx/dist,dy/dist
-        nx,ny=-uy,ux
-        
-        # Aplicar desplazamiento perpendicular de la línea
-        x1_disp, y1_disp = x1 + nx * desplazamiento, y1 + ny * desplazamiento
-        x2_disp, y2_disp = x2 + nx * desplazamiento, y2 + ny * desplazamiento
-        
-        # Ajustar los puntos de inicio y fin para que no toquen el centro del nodo
-        offset = RADIO_NODO + 2
-        x1_adj, y1_adj = x1_disp + ux * offset, y1_disp + uy * offset
-        x2_adj, y2_adj = x2_disp - ux * offset, y2_disp - uy * offset
-        mx,my=(x1_adj+x2_adj)/2,(y1_adj+y2_adj)/2
-        
-        # Desplazamiento del texto de flujo, opuesto a la capacidad
-        flujo_offset = 20 if existe_opuesta else 10 # Desplazar lo suficiente
-        
-        px,py = mx - nx * flujo_offset, my - ny * flujo_offset # Mover en la dirección opuesta al texto de capacidad
-        
-        etiqueta=f"{int(f)}"
-        self.canvas.create_text(px,py,text=etiqueta,fill=COLORES["arista_flujo_texto"],font=("Arial",11,"bold"), 
-                                tags=f"flow_text_{u}_{v}", 
-                                anchor="center", 
-                                justify="center",
-                                )
+        # Con poco zoom las etiquetas se amontonan: se ocultan
+        estado = "normal" if self.zoom >= ZOOM_ETIQUETAS else "hidden"
+        for clave in ("cap", "flujo"):
+            if items[clave] is not None:
+                self.canvas.itemconfigure(items[clave], state=estado)
 
 # ---------- main ----------
 if __name__=="__main__":
-    raiz=tk.Tk()
-    app=FlujoMaximoGUI(raiz)
-    raiz.mainloop()
+    app=FlujoMaximoGUI()
+    app.raiz.mainloop()
@@ -0,0 +1,275 @@
+"""Lectura en streaming de grafos grandes.
+
+Los archivos se recorren línea por línea y cada arista se agrega directamente a
+arreglos tipados (``array``), sin construir tuplas ni diccionarios por arista.
+Formatos admitidos:
+
+- JSONL: una arista por línea, ``[u, v, c]`` o ``{"u": .., "v": .., "c": ..}``;
+  una línea ``{"origen": .., "destino": ..}`` define s y t.
+- Lista de aristas: ``u v c`` separados por espacios; ``#`` inicia comentario.
+- DIMACS (max-flow): ``p max N M``, ``n ID s|t``, ``a U V C``; ``c`` comenta.
+
+Además hay un formato binario (``.fbin``) que se carga con ``mmap`` sin copiar:
+cabecera, tabla de IDs de nodo (JSON) y arreglos contiguos int32/float64 de
+colas, cabezas, capacidades y, opcionalmente, flujos.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from nucleo_flujo import TablaNodos
+
+MAGIA_BINARIA = b"FLUJOBN1"
+# magia, versión, banderas, n, m, origen, destino, bytes de la tabla de nodos
+_CABECERA = struct.Struct("<8sIIqqqqq")
+_CON_FLUJOS = 1
+
+
+class AristasCompactas:
+    """Aristas en arreglos paralelos: colas/cabezas (int32) y capacidades (float64).
+
+    ``tabla`` guarda los IDs originales; las aristas usan su índice.
+    """
+
+    def __init__(self, tabla=None):
+        self.tabla = tabla if tabla is not None else TablaNodos()
+        self.colas = array("i")
+        self.cabezas = array("i")
+        self.capacidades = array("d")
+        self.origen = None
+        self.destino = None
+        self.flujos = None  # solo en archivos binarios que guardan un flujo calculado
+        self.mapa = None    # mmap que respalda los arreglos al cargar un binario
+
+    @property
+    def nodos(self):
+        return self.tabla.ids
+
+    @property
+    def indice(self):
+        return self.tabla.indice
+
+    @property
+    def n(self):
+        return len(self.tabla)
+
+    def __len__(self):
+        return len(self.colas)
+
+    def nodo(self, nid):
+        # Índice del nodo, registrándolo si es nuevo
+        return self.tabla.agregar(nid)
+
+
+def detectar_formato(ruta):
+    with open(ruta, "rb") as f:
+        if f.read(len(MAGIA_BINARIA)) == MAGIA_BINARIA:
+            return "binario"
+    if ruta.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if ruta.endswith((".max", ".dimacs")):
+        return "dimacs"
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea or linea.startswith("#"):
+                continue
+            if linea[0] in "[{":
+                return "jsonl"
+            if linea[:2] in ("p ", "c ", "a ", "n ") or linea in ("c", "p"):
+                return "dimacs"
+            return "lista"
+    return "lista"
+
+
+def leer_aristas(ruta, formato=None):
+    """Lee un grafo de un archivo por líneas y devuelve ``AristasCompactas``."""
+    formato = formato or detectar_formato(ruta)
+    if formato == "binario":
+        return cargar_binario(ruta)
+    lectores = {"jsonl": _leer_jsonl, "lista": _leer_lista, "dimacs": _leer_dimacs}
+    if formato not in lectores:
+        raise ValueError(f"Formato desconocido: {formato}")
+    grafo = AristasCompactas()
+    with open(ruta, "r", encoding="utf-8") as f:
+        lectores[formato](f, grafo)
+    return grafo
+
+
+def _leer_jsonl(f, grafo):
+    nodo, colas, cabezas, caps = grafo.nodo, grafo.colas, grafo.cabezas, grafo.capacidades
+    for numero, linea in enumerate(f, 1):
+        if not linea.strip():
+            continue
+        try:
+            dato = json.loads(linea)
+        except ValueError as e:
+            raise ValueError(f"Línea {numero}: JSON inválido ({e})") from None
+        if isinstance(dato, list) and len(dato) == 3:
+            u, v, c = dato
+        elif isinstance(dato, dict) and "u" in dato:
+            u, v, c = dato["u"], dato.get("v"), dato.get("c", dato.get("capacidad"))
+        elif isinstance(dato, dict):
+            grafo.origen = dato.get("origen", grafo.origen)
+            grafo.destino = dato.get("destino", grafo.destino)
+            continue
+        else:
+            raise ValueError(f"Línea {numero}: se esperaba [u, v, c] o un objeto con u, v y c")
+        if v is None or c is None:
+            raise ValueError(f"Línea {numero}: falta {'el nodo v' if v is None else 'la capacidad'}")
+        try:
+            capacidad = float(c)
+            i, j = nodo(u), nodo(v)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Línea {numero}: arista inválida ({e})") from None
+        colas.append(i)
+        cabezas.append(j)
+        caps.append(capacidad)
+
+
+def _leer_lista(f, grafo):
+    nodo, colas, cabezas, caps = grafo.nodo, grafo.colas, grafo.cabezas, grafo.capacidades
+    for numero, linea in enumerate(f, 1):
+        campos = linea.split("#", 1)[0].split()
+        if not campos:
+            continue
+        if len(campos) != 3:
+            raise ValueError(f"Línea {numero}: se esperaba 'u v capacidad'")
+        try:
+            capacidad = float(campos[2])
+        except ValueError:
+            raise ValueError(f"Línea {numero}: capacidad inválida '{campos[2]}'") from None
+        colas.append(nodo(campos[0]))
+        cabezas.append(nodo(campos[1]))
+        caps.append(capacidad)
+
+
+def _leer_dimacs(f, grafo):
+    # Los nodos DIMACS son 1..N: se registran de antemano y el índice es ID-1
+    colas, cabezas, caps = grafo.colas, grafo.cabezas, grafo.capacidades
+    for numero, linea in enumerate(f, 1):
+        campos = linea.split()
+        if not campos or campos[0] == "c":
+            continue
+        tipo = campos[0]
+        try:
+            if tipo == "a":
+                if len(campos) != 4:
+                    raise ValueError("se esperaba 'a U V C'")
+                u, v, c = int(campos[1]) - 1, int(campos[2]) - 1, float(campos[3])
+                colas.append(u)
+                cabezas.append(v)
+                caps.append(c)
+            elif tipo == "p":
+                if len(campos) < 3 or campos[1] != "max":
+                    raise ValueError("solo se admite el problema 'p max'")
+                for nid in range(1, int(campos[2]) + 1):
+                    grafo.nodo(nid)
+            elif tipo == "n":
+                if len(campos) != 3 or campos[2] not in ("s", "t"):
+                    raise ValueError("se esperaba 'n ID s' o 'n ID t'")
+                if campos[2] == "s":
+                    grafo.origen = int(campos[1])
+                else:
+                    grafo.destino = int(campos[1])
+            else:
+                raise ValueError(f"descriptor DIMACS desconocido '{tipo}'")
+        except ValueError as e:
+            raise ValueError(f"Línea {numero}: {e}") from None
+    if colas and (max(max(colas), max(cabezas)) >= grafo.n or min(min(colas), min(cabezas)) < 0):
+        raise ValueError("Hay arcos con nodos fuera del rango declarado en 'p max'")
+
+
+def guardar_binario(ruta, nodos, colas, cabezas, capacidades, origen=None, destino=None, flujos=None):
+    """Escribe el grafo (y opcionalmente sus flujos) en el formato binario.
+
+    ``origen`` y ``destino`` son índices en ``nodos`` (o None).
+    """
+    _exigir_little_endian()
+    tabla = json.dumps(list(nodos), ensure_ascii=False).encode("utf-8")
+    tabla += b" " * (-len(tabla) % 8)
+    m = len(colas)
+    bloques = [_como_arreglo("i", colas), _como_arreglo("i", cabezas), _como_arreglo("d", capacidades)]
+    if flujos is not None:
+        bloques.append(_como_arreglo("d", flujos))
+    if any(len(b) != m for b in bloques):
+        raise ValueError("Los arreglos de aristas deben tener la misma longitud")
+    with open(ruta, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA_BINARIA, 1, _CON_FLUJOS if flujos is not None else 0, len(nodos), m,
+                               -1 if origen is None else origen, -1 if destino is None else destino, len(tabla)))
+        f.write(tabla)
+        for bloque in bloques:
+            f.write(memoryview(bloque))
+        # colas y cabezas suman 8m bytes, así los bloques float64 quedan alineados
+
+
+def cargar_binario(ruta):
+    """Carga un archivo binario con ``mmap``: los arreglos son vistas sin copia.
+
+    Devuelve ``AristasCompactas`` cuyos arreglos son ``memoryview`` de solo
+    lectura sobre el archivo (más ``flujos`` si el archivo los incluye). El
+    mapeo se mantiene abierto mientras viva el objeto.
+    """
+    _exigir_little_endian()
+    with open(ruta, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    vista = memoryview(mapa)
+    if len(vista) < _CABECERA.size:
+        raise ValueError("Archivo binario truncado")
+    magia, version, banderas, n, m, origen, destino, largo_tabla = _CABECERA.unpack_from(vista)
+    if magia != MAGIA_BINARIA or version != 1:
+        raise ValueError("No es un archivo de grafo binario compatible")
+    pos = _CABECERA.size + largo_tabla
+    fin = pos + 16*m + (8*m if banderas & _CON_FLUJOS else 0)
+    if len(vista) < fin:
+        raise ValueError("Archivo binario truncado")
+
+    grafo = AristasCompactas(TablaNodos(json.loads(bytes(vista[_CABECERA.size:pos]).decode("utf-8"))))
+    if grafo.n != n:
+        raise ValueError("La tabla de nodos no coincide con la cabecera")
+    grafo.colas = vista[pos:pos + 4*m].cast("i")
+    grafo.cabezas = vista[pos + 4*m:pos + 8*m].cast("i")
+    grafo.capacidades = vista[pos + 8*m:pos + 16*m].cast("d")
+    grafo.flujos = vista[pos + 16*m:fin].cast("d") if banderas & _CON_FLUJOS else None
+    grafo.origen = grafo.nodos[origen] if origen >= 0 else None
+    grafo.destino = grafo.nodos[destino] if destino >= 0 else None
+    grafo.mapa = mapa
+    return grafo
+
+
+def _como_arreglo(tipo, datos):
+    if isinstance(datos, array) and datos.typecode == tipo:
+        return datos
+    if isinstance(datos, memoryview) and datos.format == tipo:
+        return datos
+    return array(tipo, datos)
+
+
+def _exigir_little_endian():
+    if sys.byteorder != "little":
+        raise OSError("El formato binario solo se admite en máquinas little-endian")
+
+
+def main(argv=None):
+    # Conversión de cualquier formato por líneas al binario:
+    #   python formatos_grafo.py red.max red.fbin
+    import argparse
+    parser = argparse.ArgumentParser(description="Convierte un grafo por líneas al formato binario (.fbin).")
+    parser.add_argument("entrada")
+    parser.add_argument("salida")
+    parser.add_argument("--formato", choices=["jsonl", "lista", "dimacs"])
+    args = parser.parse_args(argv)
+
+    grafo = leer_aristas(args.entrada, args.formato)
+    origen = grafo.indice.get(grafo.origen)
+    destino = grafo.indice.get(grafo.destino)
+    guardar_binario(args.salida, grafo.nodos, grafo.colas, grafo.cabezas, grafo.capacidades, origen, destino)
+    print(f"{args.salida}: {grafo.n} nodos, {len(grafo)} aristas, {os.path.getsize(args.salida)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Disposición automática de nodos para grafos grandes (sin tkinter).
+
+- ``disposicion_capas``: columnas por distancia BFS desde el origen (el
+  destino en la última), ordenadas dentro de cada columna por el baricentro
+  de sus predecesores para reducir cruces. O(N + E).
+- ``DisposicionFuerzas``: dirigida por fuerzas (Fruchterman–Reingold) con la
+  repulsión aproximada por un quadtree de Barnes–Hut, O(N log N) por
+  iteración. Avanza por pasos acotados en tiempo, para refinar el dibujo de a
+  poco desde el bucle de eventos de la interfaz.
+
+Las posiciones son coordenadas del mundo: ``{nid: (x, y)}``.
+"""
+import math
+import random
+import time
+from collections import deque
+
+SEPARACION_MIN = 70   # distancia mínima entre nodos vecinos de una columna / entre columnas
+THETA = 0.9           # precisión de Barnes–Hut: celdas con lado/distancia < THETA se aproximan
+ITERACIONES = 300
+
+
+def disposicion_capas(nodos, aristas, origen=None, destino=None, ancho=800, alto=600, margen=60):
+    """Coloca ``nodos`` en columnas según su distancia BFS desde ``origen``.
+
+    ``aristas`` son pares ``(u, v)``. Los nodos que el origen no alcanza van
+    en una columna final; sin origen se empieza por los nodos sin entradas.
+    """
+    nodos = list(nodos)
+    sucesores = {nid: [] for nid in nodos}
+    predecesores = {nid: [] for nid in nodos}
+    for u, v in aristas:
+        if u in sucesores and v in sucesores and u != v:
+            sucesores[u].append(v)
+            predecesores[v].append(u)
+
+    if origen in sucesores:
+        raices = [origen]
+    else:
+        raices = [nid for nid in nodos if not predecesores[nid]] or nodos[:1]
+    capa = dict.fromkeys(raices, 0)
+    cola = deque(raices)
+    while cola:
+        u = cola.popleft()
+        for v in sucesores[u]:
+            if v not in capa:
+                capa[v] = capa[u] + 1
+                cola.append(v)
+    ultima = max(capa.values(), default=0)
+    if destino in capa and destino != origen:
+        # El destino siempre a la derecha, solo en su columna
+        ultima += any(c == ultima and nid != destino for nid, c in capa.items())
+        capa[destino] = ultima
+    sueltos = [nid for nid in nodos if nid not in capa]
+    for nid in sueltos:
+        capa[nid] = ultima + 1
+
+    columnas = [[] for _ in range(max(capa.values(), default=0) + 1)]
+    for nid in nodos:
+        columnas[capa[nid]].append(nid)
+    columnas = [c for c in columnas if c]
+
+    # Orden dentro de la columna: baricentro de los predecesores ya ubicados
+    fila = {}
+    for columna in columnas:
+        def baricentro(nid):
+            previos = [fila[p] for p in predecesores[nid] if p in fila]
+            return sum(previos) / len(previos) if previos else math.inf
+        columna.sort(key=baricentro)
+        for k, nid in enumerate(columna):
+            fila[nid] = k - (len(columna) - 1) / 2
+
+    paso_x = max(SEPARACION_MIN, (ancho - 2*margen) / max(1, len(columnas) - 1))
+    posiciones = {}
+    for i, columna in enumerate(columnas):
+        paso_y = max(SEPARACION_MIN, (alto - 2*margen) / len(columna))
+        for nid in columna:
+            posiciones[nid] = (margen + i*paso_x, alto / 2 + fila[nid]*paso_y)
+    return posiciones
+
+
+class DisposicionFuerzas:
+    """Disposición dirigida por fuerzas que se calcula de a pasos.
+
+    ``paso(segundos)`` avanza hasta agotar el presupuesto de tiempo (siempre
+    algo de trabajo) y se puede interrumpir en medio de una iteración: la
+    repulsión de cada iteración se calcula por tramos de nodos sobre el mismo
+    quadtree. ``posiciones`` siempre tiene el último estado completo.
+    """
+
+    def __init__(self, nodos, aristas, posiciones=None, ancho=800, alto=600, iteraciones=ITERACIONES, semilla=0):
+        self.nodos = list(nodos)
+        indice = {nid: i for i, nid in enumerate(self.nodos)}
+        self.aristas = [(indice[u], indice[v]) for u, v in aristas
+                        if u in indice and v in indice and u != v]
+        n = len(self.nodos)
+        rng = random.Random(semilla)
+        posiciones = posiciones or {}
+        self.xs, self.ys = [0.0]*n, [0.0]*n
+        for i, nid in enumerate(self.nodos):
+            x, y = posiciones.get(nid) or (rng.uniform(0, ancho), rng.uniform(0, alto))
+            self.xs[i], self.ys[i] = float(x), float(y)
+
+        # Área de referencia: crece con N para que la densidad no dependa del tamaño
+        area = max(ancho*alto, n * SEPARACION_MIN**2 * 2)
+        self.k = math.sqrt(area / max(1, n))
+        self.temperatura = math.sqrt(area) / 10
+        self.enfriamiento = self.temperatura / max(1, iteraciones)
+        self.iteracion = 0
+        self.iteraciones = iteraciones
+        self._arbol = None
+        self._siguiente = 0
+        self._dx, self._dy = [0.0]*n, [0.0]*n
+
+    @property
+    def terminado(self):
+        return self.iteracion >= self.iteraciones or len(self.nodos) < 2
+
+    @property
+    def posiciones(self):
+        return {nid: (self.xs[i], self.ys[i]) for i, nid in enumerate(self.nodos)}
+
+    def paso(self, segundos=0.02):
+        limite = time.perf_counter() + segundos
+        while not self.terminado:
+            if self._arbol is None:
+                self._arbol = _Quadtree(self.xs, self.ys)
+                self._siguiente = 0
+            # Repulsión por tramos, revisando el reloj cada tanto
+            fin = min(len(self.nodos), self._siguiente + 64)
+            for i in range(self._siguiente, fin):
+                self._dx[i], self._dy[i] = self._arbol.repulsion(i, self.xs[i], self.ys[i], self.k)
+            self._siguiente = fin
+            if fin == len(self.nodos):
+                self._cerrar_iteracion()
+            if time.perf_counter() >= limite:
+                break
+        return self.terminado
+
+    def _cerrar_iteracion(self):
+        xs, ys, dx, dy, k = self.xs, self.ys, self._dx, self._dy, self.k
+        for u, v in self.aristas:
+            ex, ey = xs[u] - xs[v], ys[u] - ys[v]
+            d = math.hypot(ex, ey) or 0.01
+            f = d / k  # (d²/k) / d
+            dx[u] -= ex*f; dy[u] -= ey*f
+            dx[v] += ex*f; dy[v] += ey*f
+        t = self.temperatura
+        for i in range(len(xs)):
+            d = math.hypot(dx[i], dy[i])
+            if d > 0:
+                m = min(d, t) / d
+                xs[i] += dx[i]*m
+                ys[i] += dy[i]*m
+        self.temperatura = max(self.temperatura - self.enfriamiento, self.k / 100)
+        self.iteracion += 1
+        self._arbol = None
+
+
+class _Quadtree:
+    # Celdas en arreglos paralelos: esquina, lado, masa, suma de posiciones,
+    # primer hijo (4 consecutivos, -1 en hojas) y nodo de la hoja (-1 si vacía)
+
+    def __init__(self, xs, ys):
+        x0, y0 = min(xs), min(ys)
+        lado = max(max(xs) - x0, max(ys) - y0) or 1.0
+        self.x0, self.y0, self.lado = [x0], [y0], [lado*1.0001]
+        self.masa, self.sx, self.sy = [0], [0.0], [0.0]
+        self.hijos, self.punto = [-1], [-1]
+        for i in range(len(xs)):
+            self._insertar(i, xs[i], ys[i], xs, ys)
+
+    def _nueva(self, x0, y0, lado):
+        self.x0.append(x0); self.y0.append(y0); self.lado.append(lado)
+        self.masa.append(0); self.sx.append(0.0); self.sy.append(0.0)
+        self.hijos.append(-1); self.punto.append(-1)
+
+    def _cuadrante(self, c, x, y):
+        mitad = self.lado[c] / 2
+        return (x >= self.x0[c] + mitad) + 2*(y >= self.y0[c] + mitad)
+
+    def _insertar(self, i, x, y, xs, ys):
+        c = 0
+        while True:
+            self.masa[c] += 1
+            self.sx[c] += x
+            self.sy[c] += y
+            if self.hijos[c] >= 0:
+                c = self.hijos[c] + self._cuadrante(c, x, y)
+                continue
+            if self.masa[c] == 1:
+                self.punto[c] = i
+                return
+            if self.lado[c] < 1e-6:
+                return  # puntos coincidentes: la hoja acumula la masa
+            # Hoja ocupada: dividirla y bajar el punto que tenía
+            base, mitad = len(self.masa), self.lado[c] / 2
+            for q in range(4):
+                self._nueva(self.x0[c] + mitad*(q & 1), self.y0[c] + mitad*(q >> 1), mitad)
+            self.hijos[c] = base
+            j, self.punto[c] = self.punto[c], -1
+            h = base + self._cuadrante(c, xs[j], ys[j])
+            self.masa[h], self.sx[h], self.sy[h], self.punto[h] = 1, xs[j], ys[j], j
+            c = base + self._cuadrante(c, x, y)
+
+    def repulsion(self, i, x, y, k):
+        # Fuerza k²/d de todos los demás nodos, agrupando celdas lejanas
+        masa, sx, sy, lado, hijos, punto = self.masa, self.sx, self.sy, self.lado, self.hijos, self.punto
+        k2, theta2 = k*k, THETA*THETA
+        fx = fy = 0.0
+        pila = [0]
+        while pila:
+            c = pila.pop()
+            m = masa[c]
+            if m == 0 or (punto[c] == i and m == 1):
+                continue
+            ex, ey = x - sx[c]/m, y - sy[c]/m
+            d2 = ex*ex + ey*ey
+            if hijos[c] < 0 or lado[c]*lado[c] < theta2*d2:
+                if punto[c] == i:
+                    m -= 1  # hoja con puntos coincidentes, incluido i
+                if d2 < 1e-4:
+                    # Encimados: empujar en una dirección arbitraria pero fija
+                    ex, ey, d2 = math.cos(i), math.sin(i), 1.0
+                f = m * k2 / d2  # (k²/d) / d
+                fx += ex*f
+                fy += ey*f
+            else:
+                h = hijos[c]
+                pila.extend((h, h + 1, h + 2, h + 3))
+        return fx, fy
@@ -0,0 +1,162 @@
+"""Modo por lotes: resuelve muchos grafos sin abrir la interfaz Tk.
+
+Lee el mismo formato JSON que escribe ``guardar_json`` (``nodos``, ``aristas``,
+``origen``, ``destino``) desde un directorio de archivos ``.json``, un archivo
+JSONL (un grafo por línea) o la entrada estándar (``-``), y escribe un
+resultado JSON por línea, en el mismo orden de entrada.
+
+Con ``--aristas`` la entrada es en cambio un único grafo grande en un formato
+por líneas o binario (ver ``formatos_grafo``), que se lee en streaming o con
+``mmap``.
+
+Ejemplos:
+    python lote_flujo.py grafos/ --jobs 8 > resultados.jsonl
+    python lote_flujo.py grafos.jsonl --algoritmo dinic -o resultados.jsonl
+    cat grafos.jsonl | python lote_flujo.py -
+    python lote_flujo.py red.max --aristas --algoritmo push_relabel
+    python lote_flujo.py grafos.jsonl --cache ~/.cache/flujo   # repetir un lote cuesta una consulta
+"""
+import argparse
+import functools
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_flujo import CacheFlujo
+from formatos_grafo import guardar_binario, leer_aristas
+from nucleo_flujo import ALGORITMOS, convertir_capacidad, resolver_arreglos, resolver_flujo
+
+_caches = {}  # directorio -> CacheFlujo, una por proceso
+TAREAS_POR_ENVIO = 16  # tareas que viajan juntas a un proceso de trabajo
+ENVIOS_POR_PROCESO = 2  # envíos en curso por proceso (acota la entrada leída por adelantado)
+
+
+def _cache_en(directorio):
+    if directorio not in _caches:
+        _caches[directorio] = CacheFlujo(directorio=directorio)
+    return _caches[directorio]
+
+
+def leer_tareas(ruta):
+    # Cada tarea es (nombre, ruta_archivo, texto); el JSON se decodifica en el
+    # proceso que resuelve, para repartir también ese trabajo entre núcleos
+    if ruta == "-":
+        for i, linea in enumerate(sys.stdin, 1):
+            if linea.strip():
+                yield (f"<stdin>:{i}", None, linea)
+    elif os.path.isdir(ruta):
+        for nombre in sorted(os.listdir(ruta)):
+            if nombre.endswith(".json"):
+                yield (nombre, os.path.join(ruta, nombre), None)
+    else:
+        with open(ruta, "r", encoding="utf-8") as f:
+            for i, linea in enumerate(f, 1):
+                if linea.strip():
+                    yield (f"{os.path.basename(ruta)}:{i}", None, linea)
+
+
+def resolver_tarea(tarea, algoritmo="ford_fulkerson", reducir=False, cache=None):
+    nombre, ruta, texto = tarea
+    try:
+        if texto is None:
+            with open(ruta, "r", encoding="utf-8") as f:
+                texto = f.read()
+        datos = json.loads(texto)
+        aristas = [(u, v, convertir_capacidad(c)) for u, v, c in datos.get("aristas", [])]
+        solucion = resolver_flujo(aristas, datos.get("origen"), datos.get("destino"), algoritmo=algoritmo, reducir=reducir,
+                                  cache=_cache_en(cache) if cache else None)
+        flujos = [[u, v, f] for (u, v), f in solucion.flujo_pares().items()]
+        return {"grafo": nombre, "flujo_maximo": solucion.valor, "flujos": flujos}
+    except Exception as e:
+        return {"grafo": nombre, "error": str(e)}
+
+
+def resolver_grafo_grande(ruta, algoritmo="ford_fulkerson", formato=None, origen=None, destino=None, binario=None, reducir=False):
+    grafo = leer_aristas(ruta, formato)
+    ids = [origen or grafo.origen, destino or grafo.destino]
+    for i, nid in enumerate(ids):
+        # Los IDs de la línea de comandos llegan como texto (DIMACS usa enteros)
+        if nid not in grafo.indice and isinstance(nid, str) and nid.lstrip("-").isdigit():
+            nid = int(nid)
+        if nid not in grafo.indice:
+            raise ValueError("El nodo origen o destino no está presente.")
+        ids[i] = grafo.indice[nid]
+    valor, flujos = resolver_arreglos(grafo.n, grafo.colas, grafo.cabezas, grafo.capacidades, ids[0], ids[1], algoritmo, reducir=reducir)
+    if binario:
+        guardar_binario(binario, grafo.nodos, grafo.colas, grafo.cabezas, grafo.capacidades, ids[0], ids[1], flujos)
+    return {"grafo": os.path.basename(ruta), "nodos": grafo.n, "aristas": len(grafo), "flujo_maximo": valor}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve flujo máximo para muchos grafos JSON sin interfaz gráfica.")
+    parser.add_argument("entrada", help="directorio con archivos .json, archivo JSONL o '-' para la entrada estándar")
+    parser.add_argument("-o", "--salida", help="archivo JSONL de resultados (por defecto, la salida estándar)")
+    parser.add_argument("-a", "--algoritmo", default="ford_fulkerson", choices=sorted(ALGORITMOS))
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--aristas", action="store_true", help="la entrada es un único grafo grande por líneas")
+    parser.add_argument("--formato", choices=["jsonl", "lista", "dimacs", "binario"], help="formato de --aristas (por defecto se detecta)")
+    parser.add_argument("--origen", help="nodo origen para --aristas (si el archivo no lo define)")
+    parser.add_argument("--destino", help="nodo destino para --aristas (si el archivo no lo define)")
+    parser.add_argument("--guardar-binario", metavar="RUTA", help="con --aristas, guarda el grafo y su flujo en formato binario")
+    parser.add_argument("--reducir", action="store_true", help="quitar nodos muertos y contraer cadenas antes de resolver")
+    parser.add_argument("--cache", metavar="DIR", help="directorio de caché de resultados (grafos ya resueltos no se recalculan)")
+    args = parser.parse_args(argv)
+
+    resolver = functools.partial(resolver_tarea, algoritmo=args.algoritmo, reducir=args.reducir, cache=args.cache)
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    errores = 0
+    try:
+        if args.aristas:
+            try:
+                resultado = resolver_grafo_grande(args.entrada, args.algoritmo, args.formato, args.origen,
+                                                  args.destino, args.guardar_binario, args.reducir)
+            except (OSError, ValueError) as e:
+                resultado = {"grafo": os.path.basename(args.entrada), "error": str(e)}
+            errores = _escribir([resultado], salida)
+        elif args.jobs == 1:
+            resultados = map(resolver, leer_tareas(args.entrada))
+            errores = _escribir(resultados, salida)
+        else:
+            procesos = args.jobs or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                resultados = _resolver_en_paralelo(pool, resolver, leer_tareas(args.entrada), procesos)
+                errores = _escribir(resultados, salida)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    return 1 if errores else 0
+
+
+def _resolver_en_paralelo(pool, resolver, tareas, procesos):
+    # Como pool.map, pero sin enviar toda la entrada de una vez: con a lo sumo
+    # ENVIOS_POR_PROCESO envíos por proceso en curso, un JSONL o stdin enorme
+    # se sigue leyendo a medida que salen los resultados, en orden de entrada
+    en_curso = deque()
+    tareas = iter(tareas)
+    while True:
+        bloque = list(itertools.islice(tareas, TAREAS_POR_ENVIO))
+        if bloque:
+            en_curso.append(pool.submit(_resolver_bloque, resolver, bloque))
+        if en_curso and (not bloque or len(en_curso) >= ENVIOS_POR_PROCESO * procesos):
+            yield from en_curso.popleft().result()
+        elif not bloque:
+            return
+
+
+def _resolver_bloque(resolver, bloque):
+    return [resolver(tarea) for tarea in bloque]
+
+
+def _escribir(resultados, salida):
+    errores = 0
+    for r in resultados:
+        errores += "error" in r
+        salida.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return errores
+
+
+if __name__ == "__main__":
+    sys.exit(main())
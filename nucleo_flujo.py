@@ -0,0 +1,1357 @@
+"""Núcleo de cálculo de flujo máximo, independiente de la interfaz gráfica.
+
+Se puede importar sin tkinter (modo por lotes, procesos de trabajo, servidores).
+"""
+import math
+import time
+from array import array
+
+
+class TablaNodos:
+    """Tabla persistente de IDs de nodo (texto, enteros, ...) a índices densos.
+
+    Los índices se asignan en orden de llegada y no cambian al agregar nodos,
+    así el solver trabaja sobre 0..n-1 sin reordenar ni reconstruir mapeos.
+    """
+
+    def __init__(self, ids=()):
+        self.ids = []
+        self.indice = {}
+        for nid in ids:
+            self.agregar(nid)
+
+    def agregar(self, nid):
+        # Índice del nodo, registrándolo si es nuevo
+        i = self.indice.get(nid)
+        if i is None:
+            i = self.indice[nid] = len(self.ids)
+            self.ids.append(nid)
+        return i
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, nid):
+        return nid in self.indice
+
+    def __getitem__(self, nid):
+        return self.indice[nid]
+
+
+def convertir_capacidad(valor):
+    # Las capacidades enteras se guardan como int (también "7" o 7.0): los
+    # cálculos quedan exactos y el escalamiento no necesita punto fijo
+    if isinstance(valor, str):
+        valor = valor.strip()
+        try:
+            return int(valor)
+        except ValueError:
+            valor = float(valor)
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+class GrafoResidual:
+    """Grafo residual disperso en formato CSR (arcos contiguos por nodo).
+
+    Cada arista (u, v, c) genera un arco directo u->v con capacidad c y un arco
+    inverso v->u con capacidad 0 (o la de ``capacidades_inversas``, para aristas
+    no dirigidas); ``inversa[a]`` apunta al arco emparejado.
+    """
+
+    def __init__(self, n, colas, cabezas, capacidades, capacidades_inversas=None):
+        m = len(colas)
+        self.n = n
+        self.m = m
+
+        # Contar arcos salientes por nodo (directos + inversos) y acumular
+        inicio = [0]*(n+1)
+        for u in colas:
+            inicio[u+1] += 1
+        for v in cabezas:
+            inicio[v+1] += 1
+        for i in range(n):
+            inicio[i+1] += inicio[i]
+
+        cabeza = [0]*(2*m)
+        capacidad = [0]*(2*m)
+        inversa = [0]*(2*m)
+        arco_arista = [0]*m
+        siguiente = inicio[:n]
+        for i in range(m):
+            u, v, c = colas[i], cabezas[i], capacidades[i]
+            a = siguiente[u]; siguiente[u] += 1
+            b = siguiente[v]; siguiente[v] += 1
+            cabeza[a], capacidad[a], inversa[a] = v, c, b
+            cabeza[b], capacidad[b], inversa[b] = u, 0 if capacidades_inversas is None else capacidades_inversas[i], a
+            arco_arista[i] = a
+
+        self.inicio = inicio          # arcos de u: inicio[u] .. inicio[u+1]-1
+        self.cabeza = cabeza          # nodo al que llega cada arco
+        self.capacidad = capacidad    # capacidad original de cada arco
+        self.residual = capacidad[:]  # capacidad residual actual
+        self.inversa = inversa        # índice del arco emparejado
+        self.arco_arista = arco_arista  # arco directo de la i-ésima arista
+
+    def flujo_arista(self, i):
+        # Se lee del arco inverso: su residual arranca en su capacidad (0 si la
+        # arista es dirigida) y crece con el flujo, así que un flujo chico en
+        # una arista de capacidad grande no pierde precisión en la resta
+        b = self.inversa[self.arco_arista[i]]
+        return self.residual[b] - self.capacidad[b]
+
+    def aumentar(self, arcos, cantidad):
+        # Empujar 'cantidad' a lo largo de una lista de arcos
+        residual, inversa = self.residual, self.inversa
+        for a in arcos:
+            residual[a] -= cantidad
+            residual[inversa[a]] += cantidad
+
+
+class CalculoCancelado(Exception):
+    """El cálculo se detuvo porque se pidió cancelarlo desde su monitor."""
+
+
+class EstadisticasFlujo:
+    """Contadores y tiempos por fase de un cálculo (``resolver_flujo(estadisticas=True)``).
+
+    ``busquedas`` cuenta recorridos del grafo residual (DFS de Ford–Fulkerson,
+    BFS de Edmonds–Karp, fases de Dinic y reetiquetados globales); ``tiempos``
+    guarda segundos por fase: construcción, carga del flujo previo, reducción,
+    cálculo, extracción de flujos y corte.
+    """
+
+    def __init__(self):
+        self.aumentos = 0
+        self.busquedas = 0
+        self.nodos_visitados = 0
+        self.arcos_examinados = 0
+        self.reetiquetados = 0
+        self.tiempos = {}
+
+    def marcar(self, fase, desde):
+        # Suma a 'fase' el tiempo transcurrido desde 'desde'; devuelve el reloj actual
+        ahora = time.perf_counter()
+        self.tiempos[fase] = self.tiempos.get(fase, 0) + ahora - desde
+        return ahora
+
+    def busqueda(self, visitados, arcos):
+        self.busquedas += 1
+        self.nodos_visitados += visitados
+        self.arcos_examinados += arcos
+
+    def como_dict(self):
+        datos = dict(vars(self))
+        datos["tiempos"] = dict(self.tiempos)
+        return datos
+
+    def resumen(self):
+        tiempos = ", ".join(f"{fase} {1000*seg:.1f} ms" for fase, seg in self.tiempos.items())
+        return (f"{self.aumentos} aumentos, {self.busquedas} búsquedas, {self.nodos_visitados} nodos, "
+                f"{self.arcos_examinados} arcos" + (f", {self.reetiquetados} reetiquetados" if self.reetiquetados else "")
+                + (f" | {tiempos}" if tiempos else ""))
+
+
+class MonitorFlujo:
+    """Progreso de un cálculo en curso, legible y cancelable desde otro hilo.
+
+    Los algoritmos llaman a ``aumento`` por cada camino de aumento, con sus
+    arcos (o a ``progreso`` con el flujo acumulado, si no trabajan por
+    caminos); ambos lanzan ``CalculoCancelado`` si se llamó a ``cancelar``.
+    """
+
+    def __init__(self):
+        self.aumentos = 0
+        self.valor = 0
+        self.inicio = time.perf_counter()
+        self.cancelado = False
+        self.estadisticas = None  # EstadisticasFlujo, si se piden contadores detallados
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def transcurrido(self):
+        return time.perf_counter() - self.inicio
+
+    def preparar(self, grafo, nodos, pares, s, t):
+        # Se llama antes de ejecutar el algoritmo, con el flujo inicial ya cargado
+        pass
+
+    def aumento(self, cantidad, camino=None):
+        self.aumentos += 1
+        self.valor += cantidad
+        if self.cancelado:
+            raise CalculoCancelado()
+
+    def progreso(self, valor):
+        self.valor = valor
+        if self.cancelado:
+            raise CalculoCancelado()
+
+
+class EventosFlujo(MonitorFlujo):
+    """Monitor que registra cada camino de aumento como un evento.
+
+    Cada evento es un dict con ``camino`` (IDs de nodo de s a t), ``cuello``
+    (cantidad aumentada), ``deltas`` (pares de IDs ``(u, v)`` con su cambio de
+    flujo) y ``valor`` (flujo total después del aumento). ``inicial`` guarda el
+    flujo por par antes del primer evento. Push–relabel, el modo denso y el
+    emparejamiento bipartito no trabajan con caminos de arcos y no generan
+    eventos.
+    """
+
+    def __init__(self, al_evento=None):
+        super().__init__()
+        self.eventos = []
+        self.inicial = {}
+        self.al_evento = al_evento  # se llama con cada evento, en el hilo del cálculo
+        self._arco_par = None
+
+    def preparar(self, grafo, nodos, pares, s, t):
+        # Cada arco apunta al par de su arista y al signo del cambio de flujo
+        capacidad, residual, inversa = grafo.capacidad, grafo.residual, grafo.inversa
+        arco_par = {}
+        for (u,v), a in zip(pares, grafo.arco_arista):
+            par = (nodos[u], nodos[v])
+            arco_par[a] = (par, 1)
+            arco_par[inversa[a]] = (par, -1)
+            b = inversa[a]
+            if residual[b] > capacidad[b]:
+                self.inicial[par] = residual[b] - capacidad[b]
+        self._arco_par = arco_par
+        self._grafo, self._nodos, self._s = grafo, nodos, s
+
+    def aumento(self, cantidad, camino=None):
+        super().aumento(cantidad)
+        if camino is None or self._arco_par is None:
+            return
+        cabeza, inversa, nodos = self._grafo.cabeza, self._grafo.inversa, self._nodos
+        # Algunos algoritmos entregan el camino de t hacia s
+        if cabeza[inversa[camino[0]]] != self._s:
+            camino = camino[::-1]
+        deltas = []
+        for a in camino:
+            par, signo = self._arco_par[a]
+            deltas.append((par, signo*cantidad))
+        evento = {"camino": [nodos[self._s]] + [nodos[cabeza[a]] for a in camino],
+                  "cuello": cantidad, "deltas": deltas, "valor": self.valor}
+        self.eventos.append(evento)
+        if self.al_evento is not None:
+            self.al_evento(evento)
+
+
+# ---------------------------------------
+# Algoritmos de flujo máximo
+# ---------------------------------------
+# Cada algoritmo recibe un GrafoResidual (con un flujo válido, normalmente
+# cero), lo modifica en el lugar y devuelve cuánto flujo agregó de s a t.
+# Con un ``monitor`` (MonitorFlujo) informa su avance y se puede cancelar; tras
+# una cancelación el grafo queda a medio calcular y debe descartarse.
+ALGORITMOS = {}
+ETIQUETAS_ALGORITMOS = {}
+# Máximo de decimales al pasar capacidades fraccionarias a punto fijo
+DECIMALES_MAX = 9
+# Ruido de punto flotante admitido en un residual, en ulps de la capacidad del
+# par de arcos (lo que dejan unas pocas sumas y restas, nunca un flujo real)
+ULPS_RUIDO = 8
+
+
+def _registrar(nombre, etiqueta):
+    def decorador(funcion):
+        ALGORITMOS[nombre] = funcion
+        ETIQUETAS_ALGORITMOS[nombre] = etiqueta
+        return funcion
+    return decorador
+
+
+@_registrar("ford_fulkerson", "Ford–Fulkerson (DFS)")
+def _ford_fulkerson_dfs(grafo, s, t, monitor=None):
+    residual = grafo.residual
+    # Marcas de visita por búsqueda (se evita reinicializar arreglos de tamaño N)
+    visitado = [0]*grafo.n
+    actual = [0]*grafo.n
+    flujo_maximo = 0
+    marca = 0
+    est = monitor.estadisticas if monitor is not None else None
+    recorridos = [] if est is not None else None
+    
+    # Bucle principal de Ford-Fulkerson
+    while True:
+        marca += 1
+        camino = _camino_dfs(grafo, s, t, visitado, actual, marca, recorridos)
+        if est is not None:
+            inicio = grafo.inicio
+            est.busqueda(len(recorridos), sum(actual[u] - inicio[u] for u in recorridos))
+            recorridos.clear()
+        
+        if camino is None:
+            break
+            
+        # Actualizar el flujo a lo largo del camino encontrado
+        aumento = min(residual[a] for a in camino)
+        grafo.aumentar(camino, aumento)
+        flujo_maximo += aumento
+        if monitor is not None:
+            monitor.aumento(aumento, camino)
+
+    return flujo_maximo
+
+
+def _camino_dfs(grafo, s, t, visitado, actual, marca, recorridos=None, umbral=0):
+    # DFS iterativa (pila explícita de arcos) que devuelve los arcos de un
+    # camino de aumento de s a t, o None si no existe. 'actual[u]' es el arco
+    # actual de u: al volver de un hijo sin salida se continúa desde ahí, así
+    # ningún arco se examina dos veces en la misma búsqueda. Si se pasa
+    # 'recorridos', se le agregan los nodos visitados (para estadísticas).
+    # Solo se usan arcos con residual > 'umbral'.
+    inicio, cabeza, residual, inversa = grafo.inicio, grafo.cabeza, grafo.residual, grafo.inversa
+    visitado[s] = marca
+    actual[s] = inicio[s]
+    if recorridos is not None:
+        recorridos.append(s)
+    pila = []
+    u = s
+    while u != t:
+        a, fin = actual[u], inicio[u+1]
+        while a < fin and (residual[a] <= umbral or visitado[cabeza[a]] == marca):
+            a += 1
+        if a < fin:
+            actual[u] = a + 1
+            pila.append(a)
+            u = cabeza[a]
+            visitado[u] = marca
+            actual[u] = inicio[u]
+            if recorridos is not None:
+                recorridos.append(u)
+        elif pila:
+            u = cabeza[inversa[pila.pop()]]
+        else:
+            return None
+    return pila
+
+
+@_registrar("escalamiento", "Escalamiento de capacidad (Δ)")
+def _escalamiento_capacidad(grafo, s, t, monitor=None):
+    # Ford–Fulkerson por fases: en la fase Δ solo se aumenta por caminos con
+    # residual >= Δ y Δ se divide a la mitad entre fases, hasta Δ = 1. Son
+    # O(E log U) aumentos en vez de O(valor del flujo). Los residuales se
+    # pasan a enteros (punto fijo si hay fracciones) y la aritmética es exacta.
+    residual = grafo.residual
+    escala = _escala_entera(residual)
+    if escala is None:
+        # Fracciones que no entran en DECIMALES_MAX decimales (1/3, 1/7, ...):
+        # redondearlas rompería la conservación, se resuelve con Ford–Fulkerson
+        return _ford_fulkerson_dfs(grafo, s, t, monitor)
+    residual[:] = [round(r*escala) for r in residual]
+    try:
+        mayor = max(residual, default=0)
+        if mayor <= 0:
+            return 0
+        visitado = [0]*grafo.n
+        actual = [0]*grafo.n
+        flujo_maximo = 0
+        marca = 0
+        est = monitor.estadisticas if monitor is not None else None
+        recorridos = [] if est is not None else None
+
+        delta = 1 << (mayor.bit_length() - 1)
+        while delta >= 1:
+            while True:
+                marca += 1
+                camino = _camino_dfs(grafo, s, t, visitado, actual, marca, recorridos, delta - 1)
+                if est is not None:
+                    inicio = grafo.inicio
+                    est.busqueda(len(recorridos), sum(actual[u] - inicio[u] for u in recorridos))
+                    recorridos.clear()
+                if camino is None:
+                    break
+                aumento = min(residual[a] for a in camino)
+                grafo.aumentar(camino, aumento)
+                flujo_maximo += aumento
+                if monitor is not None:
+                    monitor.aumento(aumento if escala == 1 else aumento / escala, camino)
+            delta >>= 1
+    finally:
+        # También tras una cancelación: el grafo vuelve a las unidades originales
+        if escala != 1:
+            residual[:] = [r / escala for r in residual]
+            _ajustar_residuales(grafo)
+    return flujo_maximo if escala == 1 else flujo_maximo / escala
+
+
+def _escala_entera(valores):
+    # Menor potencia de 10 que vuelve enteros todos los valores, o None si
+    # hacen falta más de DECIMALES_MAX decimales
+    escala = 1
+    for _ in range(DECIMALES_MAX + 1):
+        # (solo se admite el error de representación del float, no un redondeo)
+        if all(abs(v*escala - round(v*escala)) <= 1e-12 * max(1, abs(v*escala)) for v in valores):
+            return escala
+        escala *= 10
+    return None
+
+
+def _camino_desde_padres(grafo, arco_padre, s, t):
+    # Reconstruir (de t hacia s) los arcos del camino de aumento
+    cabeza, inversa = grafo.cabeza, grafo.inversa
+    camino = []
+    v = t
+    while v != s:
+        a = arco_padre[v]
+        camino.append(a)
+        v = cabeza[inversa[a]]
+    return camino
+
+
+@_registrar("edmonds_karp", "Edmonds–Karp (BFS)")
+def _edmonds_karp(grafo, s, t, monitor=None):
+    inicio, cabeza, residual = grafo.inicio, grafo.cabeza, grafo.residual
+    n = grafo.n
+    flujo_maximo = 0
+    est = monitor.estadisticas if monitor is not None else None
+
+    while True:
+        # BFS: el camino más corto (en número de aristas) del grafo residual
+        arco_padre = [-1]*n
+        arco_padre[s] = -2
+        cola = [s]
+        for u in cola:
+            for a in range(inicio[u], inicio[u+1]):
+                if residual[a] > 0:
+                    v = cabeza[a]
+                    if arco_padre[v] == -1:
+                        arco_padre[v] = a
+                        cola.append(v)
+            if arco_padre[t] != -1:
+                break
+        if est is not None:
+            est.busqueda(len(cola), sum(inicio[u+1] - inicio[u] for u in cola))
+        if arco_padre[t] == -1:
+            break
+
+        camino = _camino_desde_padres(grafo, arco_padre, s, t)
+        aumento = min(residual[a] for a in camino)
+        grafo.aumentar(camino, aumento)
+        flujo_maximo += aumento
+        if monitor is not None:
+            monitor.aumento(aumento, camino)
+
+    return flujo_maximo
+
+
+@_registrar("dinic", "Dinic (flujo bloqueante)")
+def _dinic(grafo, s, t, monitor=None):
+    inicio, cabeza, residual, inversa = grafo.inicio, grafo.cabeza, grafo.residual, grafo.inversa
+    n = grafo.n
+    flujo_maximo = 0
+    est = monitor.estadisticas if monitor is not None else None
+
+    while True:
+        # Grafo de niveles: distancia BFS desde s en el grafo residual
+        nivel = [-1]*n
+        nivel[s] = 0
+        cola = [s]
+        for u in cola:
+            siguiente = nivel[u] + 1
+            for a in range(inicio[u], inicio[u+1]):
+                if residual[a] > 0 and nivel[cabeza[a]] < 0:
+                    nivel[cabeza[a]] = siguiente
+                    cola.append(cabeza[a])
+        if est is not None:
+            est.busqueda(len(cola), sum(inicio[u+1] - inicio[u] for u in cola))
+        if nivel[t] < 0:
+            break
+
+        # Flujo bloqueante: DFS iterativa con puntero de arco actual por nodo
+        actual = inicio[:n]
+        pila = []
+        u = s
+        while True:
+            if u == t:
+                aumento = min(residual[a] for a in pila)
+                grafo.aumentar(pila, aumento)
+                flujo_maximo += aumento
+                if monitor is not None:
+                    monitor.aumento(aumento, pila)
+                # Retroceder hasta la cola del primer arco saturado
+                k = 0
+                while residual[pila[k]] > 0:
+                    k += 1
+                del pila[k:]
+                u = cabeza[pila[-1]] if pila else s
+                continue
+            fin, a, siguiente = inicio[u+1], actual[u], nivel[u] + 1
+            while a < fin and (residual[a] <= 0 or nivel[cabeza[a]] != siguiente):
+                a += 1
+            actual[u] = a
+            if a < fin:
+                pila.append(a)
+                u = cabeza[a]
+            elif pila:
+                # Nodo sin salida en este nivel: descartarlo y retroceder
+                a = pila.pop()
+                u = cabeza[inversa[a]]
+                actual[u] += 1
+            else:
+                break
+        if est is not None:
+            # Arcos recorridos por el flujo bloqueante (avance de los punteros)
+            est.arcos_examinados += sum(actual[u] - inicio[u] for u in cola)
+
+    return flujo_maximo
+
+
+@_registrar("push_relabel", "Push–Relabel (etiqueta más alta)")
+def _push_relabel(grafo, s, t, monitor=None):
+    inicio, cabeza, residual, inversa = grafo.inicio, grafo.cabeza, grafo.residual, grafo.inversa
+    n = grafo.n
+    exceso = [0]*n
+    base = monitor.valor if monitor is not None else 0  # flujo previo (reanudación)
+
+    # Preflujo inicial: saturar los arcos que salen del origen
+    for a in range(inicio[s], inicio[s+1]):
+        v, c = cabeza[a], residual[a]
+        if c > 0 and v != s:
+            residual[a] = 0
+            residual[inversa[a]] += c
+            exceso[v] += c
+
+    # Fase 1: llevar hacia t todo el exceso posible (alturas < n)
+    # Listas enlazadas en arreglos planos (sin un contenedor por nodo): pilas
+    # de nodos con exceso por altura, y listas doblemente enlazadas de todos
+    # los nodos por altura con su cantidad (para el gap)
+    altura = [n]*n
+    actual = inicio[:n]
+    activo = [-1]*n           # tope de la pila de activos de cada altura
+    sig_activo = [-1]*n
+    primero = [-1]*n          # primer nodo de cada altura
+    sig, ant = [-1]*n, [-1]*n
+    cuantos = [0]*n           # nodos en cada altura
+
+    def agregar(v, h):
+        w = primero[h]
+        sig[v], ant[v] = w, -1
+        if w >= 0:
+            ant[w] = v
+        primero[h] = v
+        cuantos[h] += 1
+
+    def quitar(v, h):
+        if ant[v] >= 0:
+            sig[ant[v]] = sig[v]
+        else:
+            primero[h] = sig[v]
+        if sig[v] >= 0:
+            ant[sig[v]] = ant[v]
+        cuantos[h] -= 1
+
+    def reetiquetado_global():
+        # Alturas exactas: distancia hasta t en el grafo residual
+        for h in range(n):
+            activo[h] = primero[h] = -1
+            cuantos[h] = 0
+        for v in range(n):
+            altura[v] = n
+            actual[v] = inicio[v]
+        altura[t] = 0
+        cola = [t]
+        for v in cola:
+            siguiente = altura[v] + 1
+            for a in range(inicio[v], inicio[v+1]):
+                u = cabeza[a]
+                if altura[u] == n and u != s and residual[inversa[a]] > 0:
+                    altura[u] = siguiente
+                    cola.append(u)
+        for v in cola:
+            h = altura[v]
+            agregar(v, h)
+            if v != t and exceso[v] > 0:
+                sig_activo[v] = activo[h]
+                activo[h] = v
+        if est is not None:
+            est.busqueda(len(cola), sum(inicio[v+1] - inicio[v] for v in cola))
+        return altura[cola[-1]]
+
+    est = monitor.estadisticas if monitor is not None else None
+    h = h_max = reetiquetado_global()
+    reetiquetados = 0
+    while h >= 0:
+        u = activo[h]
+        if u < 0:
+            h -= 1
+            continue
+        activo[h] = sig_activo[u]
+        hu, fin = altura[u], inicio[u+1]
+
+        # Descargar u: empujar por arcos admisibles y reetiquetar al agotarlos
+        while True:
+            a = actual[u]
+            if a < fin:
+                v = cabeza[a]
+                if residual[a] > 0 and altura[v] == hu - 1:
+                    d = exceso[u] if exceso[u] < residual[a] else residual[a]
+                    residual[a] -= d
+                    residual[inversa[a]] += d
+                    exceso[u] -= d
+                    if v != t and exceso[v] <= 0:
+                        sig_activo[v] = activo[hu - 1]
+                        activo[hu - 1] = v
+                    exceso[v] += d
+                    if exceso[u] <= 0:
+                        break
+                actual[u] = a + 1
+                continue
+
+            reetiquetados += 1
+            nueva = n
+            for b in range(inicio[u], fin):
+                if residual[b] > 0 and altura[cabeza[b]] < nueva:
+                    nueva = altura[cabeza[b]]
+            nueva = min(nueva + 1, n)
+            quitar(u, hu)
+            if not cuantos[hu]:
+                # Gap: los nodos por encima de hu ya no pueden alcanzar t
+                for g in range(hu + 1, h_max + 1):
+                    v = primero[g]
+                    while v >= 0:
+                        altura[v] = n
+                        v = sig[v]
+                    activo[g] = primero[g] = -1
+                    cuantos[g] = 0
+                h_max = hu - 1
+                nueva = n
+            altura[u] = hu = nueva
+            if hu >= n:
+                break
+            agregar(u, hu)
+            actual[u] = inicio[u]
+            if hu > h_max:
+                h_max = hu
+            if hu > h:
+                h = hu
+
+        if reetiquetados >= n:
+            if est is not None:
+                est.reetiquetados += reetiquetados
+            reetiquetados = 0
+            h = h_max = reetiquetado_global()
+            if monitor is not None:
+                monitor.progreso(base + exceso[t])
+
+    if est is not None:
+        est.reetiquetados += reetiquetados
+
+    # Fase 2: devolver al origen el exceso que no puede llegar a t
+    pendientes = [v for v in range(n) if v != s and v != t and exceso[v] > 0]
+    if pendientes:
+        infinito = 2*n + 1
+        altura = [infinito]*n
+        altura[s] = 0
+        cola = [s]
+        for v in cola:
+            siguiente = altura[v] + 1
+            for a in range(inicio[v], inicio[v+1]):
+                u = cabeza[a]
+                if altura[u] == infinito and u != t and residual[inversa[a]] > 0:
+                    altura[u] = siguiente
+                    cola.append(u)
+        actual = inicio[:n]
+        en_cola = [False]*n
+        for v in pendientes:
+            en_cola[v] = True
+        for u in pendientes:
+            en_cola[u] = False
+            fin = inicio[u+1]
+            while exceso[u] > 0:
+                a = actual[u]
+                if a < fin:
+                    v = cabeza[a]
+                    if residual[a] > 0 and altura[u] == altura[v] + 1:
+                        d = exceso[u] if exceso[u] < residual[a] else residual[a]
+                        residual[a] -= d
+                        residual[inversa[a]] += d
+                        exceso[u] -= d
+                        exceso[v] += d
+                        if v != s and not en_cola[v]:
+                            en_cola[v] = True
+                            pendientes.append(v)
+                        if exceso[u] <= 0:
+                            break
+                    actual[u] = a + 1
+                    continue
+                nueva = infinito
+                for b in range(inicio[u], fin):
+                    if residual[b] > 0 and altura[cabeza[b]] < nueva:
+                        nueva = altura[cabeza[b]]
+                if nueva == infinito:
+                    break
+                altura[u] = nueva + 1
+                actual[u] = inicio[u]
+
+    return exceso[t]
+
+
+def _numpy():
+    # NumPy es opcional y se importa solo al usar el modo denso
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@_registrar("denso", "Edmonds–Karp denso (NumPy)")
+def _edmonds_karp_denso(grafo, s, t, monitor=None):
+    # Sin NumPy se usa la versión dispersa en Python puro
+    np = _numpy()
+    if np is None:
+        return _edmonds_karp(grafo, s, t, monitor)
+
+    n = grafo.n
+    if not grafo.m:
+        return 0
+    inicio = np.array(grafo.inicio)
+    colas = np.repeat(np.arange(n), np.diff(inicio))
+    cabezas = np.array(grafo.cabeza, dtype=np.int64)
+    residual_arcos = np.array(grafo.residual)
+    if residual_arcos.dtype == object:
+        residual_arcos = residual_arcos.astype(float)
+
+    # Matriz residual densa: suma de los residuales de todos los arcos u->v
+    R = np.zeros((n, n), dtype=residual_arcos.dtype)
+    np.add.at(R, (colas, cabezas), residual_arcos)
+    positivo = R > 0  # máscara booleana del residual, se actualiza solo sobre cada camino
+    flujo_maximo = 0
+    est = monitor.estadisticas if monitor is not None else None
+
+    while True:
+        # BFS por fronteras: cada nivel se expande con una operación sobre filas
+        padre = np.full(n, -1)
+        visitado = np.zeros(n, dtype=bool)
+        visitado[s] = True
+        frontera = np.array([s])
+        while frontera.size and not visitado[t]:
+            filas = positivo[frontera]
+            nuevos = np.flatnonzero(filas.any(axis=0) & ~visitado)
+            if not nuevos.size:
+                break
+            padre[nuevos] = frontera[filas[:, nuevos].argmax(axis=0)]
+            visitado[nuevos] = True
+            frontera = nuevos
+        if est is not None:
+            # Cada nodo expandido revisa una fila completa de la matriz
+            visitados = int(visitado.sum())
+            est.busqueda(visitados, visitados*n)
+        if not visitado[t]:
+            break
+
+        camino = [t]
+        while camino[-1] != s:
+            camino.append(padre[camino[-1]])
+        vs, us = np.array(camino[:-1]), np.array(camino[1:])
+        aumento = R[us, vs].min()
+        R[us, vs] -= aumento
+        R[vs, us] += aumento
+        positivo[us, vs] = R[us, vs] > 0
+        positivo[vs, us] = True
+        flujo_maximo += aumento.item()
+        if monitor is not None:
+            monitor.aumento(aumento.item())
+
+    # Repartir el residual final de cada par (u, v) entre sus arcos u->v, en
+    # orden de índice y cada uno hasta su máximo (su residual más el del
+    # inverso); los arcos v->u se deducen. Se reparte R y no la diferencia con
+    # el inicial, y del sentido con menor residual: un sentido saturado (R == 0
+    # exacto) deja sus arcos exactamente en 0, y el error de redondeo es el del
+    # valor chico, no el de restarle capacidades grandes
+    residual, inversa = grafo.residual, grafo.inversa
+    objetivo = R[colas, cabezas].tolist()
+    opuesto = R[cabezas, colas].tolist()
+    pendiente = {}
+    for a, (u, v) in enumerate(zip(colas.tolist(), grafo.cabeza)):
+        if u == v or objetivo[a] > opuesto[a] or (objetivo[a] == opuesto[a] and u > v):
+            continue  # lazo, o el arco inverso es el del sentido elegido
+        b = inversa[a]
+        maximo = residual[a] + residual[b]
+        r = pendiente.get((u, v), objetivo[a])
+        x = 0 if r <= 0 else r if r < maximo else maximo
+        residual[a], residual[b] = x, maximo - x
+        resto = r - x
+        pendiente[(u, v)] = 0 if resto <= ULPS_RUIDO * math.ulp(r) else resto
+    _ajustar_residuales(grafo)
+
+    return flujo_maximo
+
+
+def _ajustar_residuales(grafo):
+    # Las sumas y restas en punto flotante pueden dejar residuales como 1e-15
+    # en arcos que deberían quedar saturados (o vacíos): se llevan al valor
+    # exacto si están a menos de ULPS_RUIDO ulps de la capacidad del par. Un
+    # flujo real, aunque sea chico frente a la capacidad, queda intacto
+    capacidad, residual, inversa = grafo.capacidad, grafo.residual, grafo.inversa
+    for a in grafo.arco_arista:
+        b = inversa[a]
+        r, q = residual[a], residual[b]
+        if type(r) is not float and type(q) is not float:
+            continue  # enteros: sin ruido
+        total = capacidad[a] + capacidad[b]
+        eps = ULPS_RUIDO * math.ulp(total)
+        if -eps <= r <= eps:
+            residual[a], residual[b] = 0, total
+        elif -eps <= q <= eps:
+            residual[a], residual[b] = total, 0
+        elif -eps <= r - capacidad[a] <= eps:
+            residual[a], residual[b] = capacidad[a], capacidad[b]
+
+
+class SolucionFlujo:
+    """Resultado de un cálculo de flujo máximo junto con su grafo residual.
+
+    Se puede pasar como ``previo`` a ``resolver_flujo`` para reanudar el
+    cálculo después de editar capacidades o agregar aristas.
+    """
+
+    def __init__(self, nodos, pares, grafo, origen, destino, valor, incremental=False, estadisticas=None, reduccion=None,
+                 bipartito=False, desde_cache=False):
+        self.nodos = nodos
+        self.pares = pares      # pares (u, v) de índices, uno por arista del grafo
+        self.grafo = grafo
+        self.origen = origen
+        self.destino = destino
+        self.valor = valor
+        self.incremental = incremental  # True si se reanudó desde un flujo previo
+        self.estadisticas = estadisticas  # EstadisticasFlujo o None
+        self.reduccion = reduccion  # (nodos, aristas) de la instancia reducida, si se redujo
+        self.bipartito = bipartito  # True si se resolvió como emparejamiento (Hopcroft–Karp)
+        self.desde_cache = desde_cache  # True si el flujo salió de una caché de resultados
+        self._corte = None
+
+    def corte_minimo(self):
+        """Corte s–t mínimo, leído del grafo residual final en un solo recorrido.
+
+        Devuelve ``(lado_origen, aristas_corte)``: el conjunto de IDs alcanzables
+        desde el origen en el residual y los pares ``(u, v)`` de IDs que cruzan
+        de ese lado al otro (todos saturados; sus capacidades suman ``valor``).
+
+        Un residual fraccionario de a lo sumo ``ULPS_RUIDO`` ulps de la
+        capacidad del par de arcos es ruido de redondeo y cuenta como saturado;
+        cualquier residual mayor es real. Si el origen alcanza al destino, el
+        flujo no es máximo y se lanza ``RuntimeError``.
+        """
+        if self._corte is None:
+            reloj = time.perf_counter()
+            grafo = self.grafo
+            inicio, cabeza, capacidad, residual, inversa = grafo.inicio, grafo.cabeza, grafo.capacidad, grafo.residual, grafo.inversa
+            alcanzado = [False]*grafo.n
+            s = self.nodos.index(self.origen)
+            alcanzado[s] = True
+            cola = [s]
+            for u in cola:
+                for a in range(inicio[u], inicio[u+1]):
+                    r = residual[a]
+                    if r > 0 and not alcanzado[cabeza[a]]:
+                        if type(r) is float and r <= ULPS_RUIDO * math.ulp(capacidad[a] + capacidad[inversa[a]]):
+                            continue  # ruido de punto flotante en un arco saturado
+                        alcanzado[cabeza[a]] = True
+                        cola.append(cabeza[a])
+            if alcanzado[self.nodos.index(self.destino)]:
+                raise RuntimeError("El flujo no es máximo: el destino sigue alcanzable en el grafo residual.")
+            nodos = self.nodos
+            lado_origen = {nodos[u] for u in cola}
+            aristas_corte = [(nodos[u], nodos[v]) for u,v in self.pares if alcanzado[u] and not alcanzado[v]]
+            self._corte = (lado_origen, aristas_corte)
+            if self.estadisticas is not None:
+                self.estadisticas.marcar("corte", reloj)
+        return self._corte
+
+    def flujo_pares(self):
+        if self.estadisticas is None:
+            return _extraer_flujo_pares(self.grafo, self.pares, self.nodos)
+        reloj = time.perf_counter()
+        flujo_pares = _extraer_flujo_pares(self.grafo, self.pares, self.nodos)
+        self.estadisticas.marcar("extraccion", reloj)
+        return flujo_pares
+
+    def flujos(self):
+        # Flujo bruto (sin cancelar pares opuestos) por par de IDs de nodo
+        grafo, nodos = self.grafo, self.nodos
+        flujos = {}
+        for i, (u,v) in enumerate(self.pares):
+            f = grafo.flujo_arista(i)
+            if f > 0:
+                flujos[(nodos[u], nodos[v])] = f
+        return flujos
+
+
+def resolver_flujo(aristas, origen, destino, algoritmo="ford_fulkerson", previo=None, tabla=None, monitor=None,
+                   estadisticas=False, perfil=None, reducir=False, bipartito=None, cache=None):
+    """Flujo máximo de ``origen`` a ``destino``; devuelve un ``SolucionFlujo``.
+
+    Con ``estadisticas=True`` la solución trae ``estadisticas``
+    (``EstadisticasFlujo``). ``perfil`` es cualquier objeto con ``enable()`` y
+    ``disable()`` (por ejemplo ``cProfile.Profile()``) que se activa solo
+    durante el algoritmo, en el hilo que llama.
+
+    Con ``reducir=True`` el algoritmo corre sobre una instancia reducida (sin
+    nodos fuera de los caminos s-t y con las cadenas contraídas) y el flujo se
+    vuelve a repartir entre las aristas originales. No se aplica al reanudar
+    desde ``previo``. Los eventos de un ``EventosFlujo`` se refieren entonces
+    a las aristas de la instancia reducida.
+
+    Si la red es un emparejamiento bipartito (origen -> izquierda -> derecha
+    -> destino, con capacidad 1 desde el origen y hacia el destino) se resuelve
+    con Hopcroft–Karp en lugar de ``algoritmo``, siempre desde cero y sin
+    eventos de caminos. ``bipartito=None`` lo detecta, ``True`` lo exige (error
+    si la red no tiene esa forma) y ``False`` lo desactiva.
+
+    ``cache`` (un ``cache_flujo.CacheFlujo``) evita resolver redes ya vistas:
+    si la red está, el flujo guardado se carga en el grafo residual sin
+    ejecutar ningún algoritmo (``desde_cache`` en la solución).
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    est = EstadisticasFlujo() if estadisticas else None
+    if est is not None:
+        reloj = time.perf_counter()
+
+    # Índices de nodo: los de la tabla persistente del llamador, o una tabla
+    # nueva con los nodos que aparecen en las aristas (en orden de aparición)
+    if tabla is None:
+        tabla = TablaNodos()
+        for u,v,_ in aristas:
+            tabla.agregar(u)
+            tabla.agregar(v)
+    nodos, idx = tabla.ids[:], tabla.indice
+    
+    if origen not in idx or destino not in idx:
+        raise ValueError("El nodo origen o destino no está presente.")
+    if origen == destino:
+        raise ValueError("El origen y el destino no pueden ser el mismo nodo.")
+
+    # Sumar capacidades si hay múltiples aristas entre los mismos nodos
+    agg = {}
+    try:
+        for u,v,c in aristas:
+            par = (idx[u], idx[v])
+            agg[par] = agg.get(par, 0) + c
+    except KeyError as e:
+        raise ValueError(f"El nodo {e.args[0]!r} no está en la tabla de nodos.") from None
+    pares = [(u,v) for (u,v),c in agg.items() if c > 0]
+    grafo = GrafoResidual(len(nodos), [u for u,_ in pares], [v for _,v in pares], [agg[p] for p in pares])
+    s, t = idx[origen], idx[destino]
+    if cache is not None:
+        clave = cache.clave(((nodos[u], nodos[v], agg[(u,v)]) for u,v in pares), origen, destino)
+        guardado = cache.obtener(clave)
+        if guardado is not None:
+            _cargar_flujo_previo(grafo, pares, nodos, guardado["flujos"], s, t)
+            if est is not None:
+                est.marcar("cache", reloj)
+            return SolucionFlujo(nodos, pares, grafo, origen, destino, guardado["valor"], estadisticas=est, desde_cache=True)
+    bipartita = _estructura_bipartita(grafo, s, t) if bipartito is not False else None
+    if bipartito and bipartita is None:
+        raise ValueError("La red no es un emparejamiento bipartito con capacidades unitarias.")
+    if est is not None:
+        reloj = est.marcar("construccion", reloj)
+
+    # Reanudar desde el flujo anterior solo si se calculó para el mismo par s-t
+    incremental = (bipartita is None and previo is not None
+                   and previo.origen == origen and previo.destino == destino)
+    flujo_maximo = _cargar_flujo_previo(grafo, pares, nodos, previo.flujos(), s, t) if incremental else 0
+    if est is not None and incremental:
+        reloj = est.marcar("carga_previa", reloj)
+    # La reducción supone un grafo sin flujo: al reanudar se resuelve completo
+    reducida = _reducir(grafo, s, t) if reducir and not incremental and bipartita is None else None
+    if est is not None:
+        if reducida is not None:
+            reloj = est.marcar("reduccion", reloj)
+        if monitor is None:
+            monitor = MonitorFlujo()
+        monitor.estadisticas = est
+    if monitor is not None:
+        if reducida is None:
+            monitor.preparar(grafo, nodos, pares, s, t)
+        monitor.progreso(flujo_maximo)
+    aumentos_previos = monitor.aumentos if monitor is not None else 0
+
+    if perfil is not None:
+        perfil.enable()
+    try:
+        if bipartita is not None:
+            flujo_maximo += _resolver_bipartito(grafo, bipartita, monitor)
+        elif reducida is not None:
+            flujo_maximo += _resolver_reducido(grafo, reducida, s, t, algoritmo, nodos, monitor)
+        else:
+            flujo_maximo += ALGORITMOS[algoritmo](grafo, s, t, monitor)
+    finally:
+        if perfil is not None:
+            perfil.disable()
+
+    if est is not None:
+        est.marcar("calculo", reloj)
+        est.aumentos = monitor.aumentos - aumentos_previos
+    reduccion = (len(reducida[0]), len(reducida[1])) if reducida is not None else None
+    solucion = SolucionFlujo(nodos, pares, grafo, origen, destino, flujo_maximo, incremental, est, reduccion,
+                             bipartita is not None)
+    if cache is not None:
+        cache.guardar(clave, flujo_maximo, solucion.flujos())
+    return solucion
+
+
+def resolver_arreglos(n, colas, cabezas, capacidades, s, t, algoritmo="ford_fulkerson", monitor=None, reducir=False):
+    """Flujo máximo sobre aristas ya indexadas (0..n-1) en arreglos paralelos.
+
+    Acepta listas o arreglos tipados (por ejemplo los de ``formatos_grafo``)
+    sin agruparlos en tuplas. Devuelve ``(valor, flujos)``, con ``flujos[i]``
+    el flujo de la i-ésima arista. ``reducir`` como en ``resolver_flujo``.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    if not (0 <= s < n and 0 <= t < n):
+        raise ValueError("El nodo origen o destino no está presente.")
+    if s == t:
+        raise ValueError("El origen y el destino no pueden ser el mismo nodo.")
+
+    grafo = GrafoResidual(n, colas, cabezas, capacidades)
+    if reducir:
+        flujo_maximo = _resolver_reducido(grafo, _reducir(grafo, s, t), s, t, algoritmo, range(n), monitor)
+    else:
+        if monitor is not None:
+            monitor.preparar(grafo, range(n), list(zip(colas, cabezas)), s, t)
+        flujo_maximo = ALGORITMOS[algoritmo](grafo, s, t, monitor)
+    flujos = array("d", [grafo.flujo_arista(i) for i in range(grafo.m)])
+    return flujo_maximo, flujos
+
+
+def ford_fulkerson(n, aristas, origen, destino, algoritmo="ford_fulkerson", tabla=None, bipartito=None):
+    solucion = resolver_flujo(aristas, origen, destino, algoritmo, tabla=tabla, bipartito=bipartito)
+    return solucion.valor, solucion.flujo_pares(), solucion.nodos
+
+
+def _cargar_flujo_previo(grafo, pares, nodos, flujos, s, t):
+    # Copiar el flujo anterior al grafo nuevo. Si una capacidad bajó, el flujo
+    # de esa arista se recorta y el desbalance resultante se repara localmente:
+    # primero se redirige el exceso hacia los nodos con déficit y solo lo que
+    # no se pueda redirigir se devuelve a s o t (igual para los déficits).
+    capacidad, residual, inversa = grafo.capacidad, grafo.residual, grafo.inversa
+    exceso = [0]*grafo.n
+    for (u,v), a in zip(pares, grafo.arco_arista):
+        f = flujos.get((nodos[u], nodos[v]), 0)
+        if f <= 0:
+            continue
+        if f > capacidad[a]:
+            f = capacidad[a]
+        residual[a] -= f
+        residual[inversa[a]] += f
+        exceso[u] -= f
+        exceso[v] += f
+
+    def es_deficit(x):
+        return x != s and x != t and exceso[x] < 0
+
+    for x in range(grafo.n):
+        if x == s or x == t:
+            continue
+        for objetivo in (es_deficit, lambda y: y == s or y == t):
+            while exceso[x] > 0 and _empujar(grafo, exceso, x, objetivo, exceso[x]):
+                pass
+    for x in range(grafo.n):
+        for fuente in (s, t):
+            while es_deficit(x) and _empujar(grafo, exceso, fuente, lambda y: y == x, -exceso[x]):
+                pass
+
+    return exceso[t]
+
+
+def _empujar(grafo, exceso, x, es_objetivo, limite):
+    # BFS en el grafo residual desde x hasta el primer nodo que cumpla
+    # es_objetivo; empuja hasta 'limite' unidades (o lo que admita el destino)
+    inicio, cabeza, residual = grafo.inicio, grafo.cabeza, grafo.residual
+    arco_padre = {x: -1}
+    cola = [x]
+    for u in cola:
+        for a in range(inicio[u], inicio[u+1]):
+            v = cabeza[a]
+            if residual[a] > 0 and v not in arco_padre:
+                arco_padre[v] = a
+                if es_objetivo(v):
+                    camino = _camino_desde_padres(grafo, arco_padre, x, v)
+                    cantidad = min(limite, min(residual[b] for b in camino))
+                    if exceso[v] < 0 and cantidad > -exceso[v]:
+                        cantidad = -exceso[v]
+                    grafo.aumentar(camino, cantidad)
+                    exceso[x] -= cantidad
+                    exceso[v] += cantidad
+                    return cantidad
+                cola.append(v)
+    return 0
+
+
+def _extraer_flujo_pares(grafo, pares, nodos):
+    # Flujo neto por par: si hay flujo en u->v y en v->u, se cancelan entre sí
+    flujo = {p: grafo.flujo_arista(i) for i, p in enumerate(pares)}
+    flujo_pares = {}
+    for (u,v), f in flujo.items():
+        if u != v:
+            f -= flujo.get((v,u), 0)
+        # Solo guardar flujos mayores a 0 para visualización
+        flujo_pares[(nodos[u], nodos[v])] = f if f > 0 else 0
+    return flujo_pares
+
+
+def _resolver_reducido(grafo, reducida, s, t, algoritmo, nodos, monitor=None):
+    # Resuelve la instancia de _reducir y copia el flujo resultante a los
+    # arcos de 'grafo' (que debe estar sin flujo); devuelve el valor
+    vivos, colas, cabezas, capacidades, partes = reducida
+    numero = {x: i for i, x in enumerate(vivos)}
+    chico = GrafoResidual(len(vivos), colas, cabezas, capacidades)
+    s2, t2 = numero[s], numero[t]
+    if monitor is not None:
+        # Los eventos de caminos se refieren a las aristas de la instancia reducida
+        monitor.preparar(chico, [nodos[x] for x in vivos], list(zip(colas, cabezas)), s2, t2)
+    valor = ALGORITMOS[algoritmo](chico, s2, t2, monitor)
+
+    # Repartir el flujo de cada arista reducida entre las aristas originales
+    residual, inversa, arco_arista = grafo.residual, grafo.inversa, grafo.arco_arista
+    for i, a in enumerate(chico.arco_arista):
+        pila = [(chico.capacidad[a] - chico.residual[a], partes[i])]
+        while pila:
+            f, (c, tipo, datos) = pila.pop()
+            if f <= 0:
+                continue
+            saturada = f >= c - ULPS_RUIDO * math.ulp(c)
+            if saturada:
+                f = c  # cada hoja a su capacidad exacta, sin restas
+            if tipo is None:
+                b = arco_arista[datos]
+                residual[b] -= f
+                residual[inversa[b]] += f
+            elif tipo == "serie":
+                pila.extend((f, p) for p in datos)
+            elif saturada:
+                pila.extend((p[0], p) for p in datos)
+            else:
+                # En paralelo: llenar la primera rama hasta su capacidad y dar
+                # el resto a la segunda. La resta tiene el redondeo de f, que
+                # puede ser grande frente a la segunda rama: un resto a unos
+                # ulps de f de 0 o de la capacidad de la rama se lleva ahí
+                izq, der = datos
+                g = f if f < izq[0] else izq[0]
+                resto, eps = f - g, ULPS_RUIDO * math.ulp(f)
+                if resto <= eps:
+                    resto = 0
+                elif resto >= der[0] - eps:
+                    resto = der[0]
+                pila.append((g, izq))
+                pila.append((resto, der))
+    # Las sumas de capacidades de las partes pueden dejar algún residual como
+    # 1e-15 en hojas que deberían quedar saturadas
+    _ajustar_residuales(grafo)
+    return valor
+
+
+def _reducir(grafo, s, t):
+    # Instancia equivalente más chica: sin lazos, sin nodos que no estén en
+    # algún camino s-t, con aristas paralelas fundidas y con cadenas de nodos
+    # de grado 2 contraídas en una arista de capacidad mínima. Cada arista
+    # resultante guarda su composición (capacidad, tipo, datos): tipo None es
+    # la arista original 'datos', "serie" y "paralelo" un par de partes. Las
+    # partes forman un árbol (no se copian listas al unir): contraer una
+    # cadena de L nodos es O(L).
+    cabeza, capacidad, inversa = grafo.cabeza, grafo.capacidad, grafo.inversa
+    sal = [dict() for _ in range(grafo.n)]
+    ent = [dict() for _ in range(grafo.n)]
+
+    def unir(u, v, parte):
+        previa = sal[u].get(v)
+        if previa is not None:
+            parte = (previa[0] + parte[0], "paralelo", (previa, parte))
+        sal[u][v] = ent[v][u] = parte
+
+    for i, a in enumerate(grafo.arco_arista):
+        u, v, c = cabeza[inversa[a]], cabeza[a], capacidad[a]
+        if u != v and c > 0:
+            if v in sal[u]:
+                unir(u, v, (c, None, i))
+            else:
+                sal[u][v] = ent[v][u] = (c, None, i)
+    _podar(sal, ent, s, t)
+
+    pendientes = [x for x in range(grafo.n) if x != s and x != t and (sal[x] or ent[x])]
+    while pendientes:
+        x = pendientes.pop()
+        salientes, entrantes = sal[x], ent[x]
+        if len(salientes) + len(entrantes) > 4:
+            continue
+        vecinos = salientes.keys() | entrantes.keys()
+        if len(vecinos) > 2:
+            continue
+        # Con uno o dos vecinos, el flujo que pasa por x solo puede seguir
+        # de un vecino al otro (lo demás serían ciclos)
+        series = []
+        if len(vecinos) == 2:
+            u, w = vecinos
+            for a, b in ((u, w), (w, u)):
+                if a in entrantes and b in salientes:
+                    entrada, salida = entrantes[a], salientes[b]
+                    series.append((a, b, (min(entrada[0], salida[0]), "serie", (entrada, salida))))
+        _quitar_nodo(sal, ent, x)
+        for a, b, parte in series:
+            unir(a, b, parte)
+        pendientes.extend(y for y in vecinos if y != s and y != t)
+    _podar(sal, ent, s, t)
+
+    vivos = [x for x in range(grafo.n) if x == s or x == t or sal[x] or ent[x]]
+    numero = {x: i for i, x in enumerate(vivos)}
+    colas, cabezas, capacidades, partes = [], [], [], []
+    for u in vivos:
+        for v, parte in sal[u].items():
+            colas.append(numero[u])
+            cabezas.append(numero[v])
+            capacidades.append(parte[0])
+            partes.append(parte)
+    return vivos, colas, cabezas, capacidades, partes
+
+
+def _podar(sal, ent, s, t):
+    # Quitar las aristas de nodos no alcanzables desde s o que no llegan a t
+    alcanzados = []
+    for inicio, adyacentes in ((s, sal), (t, ent)):
+        visto = {inicio}
+        cola = [inicio]
+        for x in cola:
+            for y in adyacentes[x]:
+                if y not in visto:
+                    visto.add(y)
+                    cola.append(y)
+        alcanzados.append(visto)
+    vivos = alcanzados[0] & alcanzados[1]
+    for x in range(len(sal)):
+        if (sal[x] or ent[x]) and x not in vivos:
+            _quitar_nodo(sal, ent, x)
+
+
+def _quitar_nodo(sal, ent, x):
+    for y in sal[x]:
+        del ent[y][x]
+    for y in ent[x]:
+        del sal[y][x]
+    sal[x].clear()
+    ent[x].clear()
+
+
+def _estructura_bipartita(grafo, s, t):
+    # Detecta s -> L (capacidad 1), L -> R (capacidad >= 1), R -> t (capacidad
+    # 1), con L y R disjuntos; las aristas que entran a s o salen de t no
+    # pueden llevar flujo y se ignoran. Devuelve (vecinos, arcos, arcos_origen,
+    # arcos_destino) con L y R numerados desde 0, o None si no tiene esa forma.
+    cabeza, capacidad, inversa = grafo.cabeza, grafo.capacidad, grafo.inversa
+    izq, der = {}, {}
+    arcos_origen, arcos_destino, medio = [], [], []
+    for a in grafo.arco_arista:
+        u, v = cabeza[inversa[a]], cabeza[a]
+        if v == s or u == t:
+            continue
+        if u == s or v == t:
+            if capacidad[a] != 1 or (u == s and v == t):
+                return None
+            if u == s:
+                izq[v] = len(arcos_origen)
+                arcos_origen.append(a)
+            else:
+                der[u] = len(arcos_destino)
+                arcos_destino.append(a)
+        else:
+            medio.append(a)
+    if izq.keys() & der.keys():
+        return None
+    vecinos = [[] for _ in arcos_origen]
+    arcos = [[] for _ in arcos_origen]
+    for a in medio:
+        l, r = izq.get(cabeza[inversa[a]]), der.get(cabeza[a])
+        if l is None or r is None or capacidad[a] < 1:
+            return None
+        vecinos[l].append(r)
+        arcos[l].append(a)
+    return vecinos, arcos, arcos_origen, arcos_destino
+
+
+def _resolver_bipartito(grafo, bipartita, monitor=None):
+    # Emparejamiento máximo con Hopcroft–Karp, copiado como flujo 0/1 al grafo
+    vecinos, arcos, arcos_origen, arcos_destino = bipartita
+    grafo.residual[:] = grafo.capacidad
+    pareja = _hopcroft_karp(vecinos, len(arcos_destino), monitor)
+    valor = 0
+    for l, r in enumerate(pareja):
+        if r >= 0:
+            grafo.aumentar((arcos_origen[l], arcos[l][vecinos[l].index(r)], arcos_destino[r]), 1)
+            valor += 1
+    return valor
+
+
+def _hopcroft_karp(vecinos, n_der, monitor=None):
+    # Por fase: BFS por capas desde los nodos libres de la izquierda hasta la
+    # primera capa con un nodo libre a la derecha, y caminos de aumento
+    # disjuntos por DFS iterativa con puntero de arco. O(E raíz(V)).
+    n_izq = len(vecinos)
+    pareja_izq = [-1]*n_izq
+    pareja_der = [-1]*n_der
+    tamano = 0
+    est = monitor.estadisticas if monitor is not None else None
+    while True:
+        dist = [-1]*n_izq
+        cola = [l for l in range(n_izq) if pareja_izq[l] < 0]
+        for l in cola:
+            dist[l] = 0
+        limite = n_izq
+        for l in cola:
+            if dist[l] >= limite:
+                break
+            for r in vecinos[l]:
+                m = pareja_der[r]
+                if m < 0:
+                    limite = dist[l]
+                elif dist[m] < 0:
+                    dist[m] = dist[l] + 1
+                    cola.append(m)
+        if est is not None:
+            est.busqueda(len(cola), sum(len(vecinos[l]) for l in cola))
+        if limite == n_izq:
+            break
+
+        actual = [0]*n_izq
+        aumentos = 0
+        for raiz in range(n_izq):
+            if pareja_izq[raiz] >= 0:
+                continue
+            pila = [raiz]
+            while pila:
+                l = pila[-1]
+                adyacentes, i = vecinos[l], actual[l]
+                while i < len(adyacentes):
+                    m = pareja_der[adyacentes[i]]
+                    if m < 0 or (dist[m] == dist[l] + 1 and dist[m] <= limite):
+                        break
+                    i += 1
+                actual[l] = i
+                if i == len(adyacentes):
+                    # Sin salida: se descarta para el resto de la fase
+                    dist[l] = -1
+                    pila.pop()
+                    if pila:
+                        actual[pila[-1]] += 1
+                elif m >= 0:
+                    pila.append(m)
+                else:
+                    # Nodo libre alcanzado: invertir el camino de la pila
+                    for x in pila:
+                        r = vecinos[x][actual[x]]
+                        pareja_izq[x] = r
+                        pareja_der[r] = x
+                    aumentos += 1
+                    break
+        tamano += aumentos
+        if monitor is not None:
+            monitor.aumentos += aumentos
+            monitor.progreso(tamano)
+    return pareja_izq
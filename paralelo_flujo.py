@@ -0,0 +1,184 @@
+"""Muchas consultas de flujo máximo sobre una misma red, en paralelo.
+
+La topología (colas, cabezas, capacidades) y los vectores de capacidad de los
+escenarios se copian una sola vez a un bloque de ``multiprocessing.shared_memory``
+con la misma disposición que el formato binario (int32, int32, float64...). Cada
+proceso de trabajo lo abre sin copiarlo, arma su grafo residual una vez y, por
+cada consulta, solo repone capacidades y residuales. A los procesos viajan
+únicamente los índices de cada consulta.
+
+    python paralelo_flujo.py red.max consultas.jsonl -j 4
+
+``consultas.jsonl`` tiene una consulta por línea: ``{"origen": .., "destino": ..}``
+y, opcionalmente, ``"capacidades": [..]`` (una por arista, en el orden del archivo).
+"""
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from nucleo_flujo import ALGORITMOS, GrafoResidual, TablaNodos
+
+_estado = None  # estado del proceso de trabajo (ver _EstadoTrabajador)
+
+
+class _EstadoTrabajador:
+    # Grafo residual armado una vez por proceso sobre los arreglos compartidos
+
+    def __init__(self, n, colas, cabezas, capacidades, escenarios, algoritmo, memoria=None):
+        self.grafo = GrafoResidual(n, colas, cabezas, capacidades)
+        self.m = len(colas)
+        self.capacidades = capacidades
+        self.escenarios = escenarios
+        self.algoritmo = ALGORITMOS[algoritmo]
+        self.fila = -1  # escenario cargado en grafo.capacidad (-1 = capacidades base)
+        self.memoria = memoria  # se mantiene abierta mientras vivan las vistas
+
+    def cargar_escenario(self, fila):
+        if fila == self.fila:
+            return
+        m = self.m
+        capacidades = self.capacidades if fila < 0 else self.escenarios[fila*m:(fila + 1)*m]
+        capacidad = self.grafo.capacidad
+        for i, a in enumerate(self.grafo.arco_arista):
+            capacidad[a] = capacidades[i]
+        self.fila = fila
+
+
+def _iniciar_trabajador(nombre, n, m, k, algoritmo):
+    global _estado
+    memoria = shared_memory.SharedMemory(name=nombre)
+    vista = memoria.buf
+    _estado = _EstadoTrabajador(n, vista[:4*m].cast("i"), vista[4*m:8*m].cast("i"), vista[8*m:16*m].cast("d"),
+                                vista[16*m:16*m + 8*m*k].cast("d"), algoritmo, memoria)
+
+
+def _resolver_consulta(tarea):
+    s, t, fila, con_flujos = tarea
+    estado = _estado
+    estado.cargar_escenario(fila)
+    grafo = estado.grafo
+    capacidad, residual = grafo.capacidad, grafo.residual
+    residual[:] = capacidad
+    valor = estado.algoritmo(grafo, s, t)
+    if not con_flujos:
+        return valor
+    return valor, array("d", [grafo.flujo_arista(i) for i in range(grafo.m)])
+
+
+def resolver_consultas(n, colas, cabezas, capacidades, consultas, algoritmo="ford_fulkerson", procesos=None, con_flujos=False):
+    """Resuelve varias consultas sobre una topología indexada (0..n-1).
+
+    Cada consulta es ``(s, t)`` o ``(s, t, capacidades)``, con un vector de
+    capacidades propio (una por arista) o None para usar las base. Devuelve
+    los valores en el orden de ``consultas`` (o ``(valor, flujos)`` con
+    ``con_flujos``). ``procesos=1`` resuelve en el proceso actual.
+    """
+    global _estado
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+    m = len(colas)
+    if len(cabezas) != m or len(capacidades) != m:
+        raise ValueError("Los arreglos de aristas deben tener la misma longitud")
+
+    # Escenarios distintos, cada uno una fila de la matriz compartida
+    escenarios, tareas = [], []
+    for consulta in consultas:
+        s, t = consulta[0], consulta[1]
+        if not (0 <= s < n and 0 <= t < n):
+            raise ValueError("El nodo origen o destino no está presente.")
+        if s == t:
+            raise ValueError("El origen y el destino no pueden ser el mismo nodo.")
+        fila = -1
+        if len(consulta) > 2 and consulta[2] is not None:
+            if len(consulta[2]) != m:
+                raise ValueError("Cada escenario debe tener una capacidad por arista")
+            fila = len(escenarios)
+            escenarios.append(consulta[2])
+        tareas.append((s, t, fila, con_flujos))
+    k = len(escenarios)
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) <= 1:
+        planos = array("d")
+        for fila in escenarios:
+            planos.extend(fila)
+        anterior, _estado = _estado, _EstadoTrabajador(n, colas, cabezas, capacidades, planos, algoritmo)
+        try:
+            return [_resolver_consulta(tarea) for tarea in tareas]
+        finally:
+            _estado = anterior
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, 16*m + 8*m*k))
+    try:
+        vista = memoria.buf
+        vista[:4*m].cast("i")[:] = array("i", colas)
+        vista[4*m:8*m].cast("i")[:] = array("i", cabezas)
+        vista[8*m:16*m].cast("d")[:] = array("d", capacidades)
+        for fila, caps in enumerate(escenarios):
+            inicio = 16*m + 8*m*fila
+            vista[inicio:inicio + 8*m].cast("d")[:] = array("d", caps)
+        del vista
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(memoria.name, n, m, k, algoritmo)) as pool:
+            return list(pool.map(_resolver_consulta, tareas, chunksize=max(1, len(tareas) // (4*procesos))))
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def resolver_consultas_ids(aristas, consultas, algoritmo="ford_fulkerson", procesos=None, tabla=None):
+    """Como ``resolver_consultas`` pero con IDs de nodo: ``aristas`` es una
+    lista de ``(u, v, c)`` y cada consulta ``(origen, destino[, capacidades])``.
+    Devuelve los valores de flujo máximo en el orden de entrada."""
+    tabla = tabla if tabla is not None else TablaNodos()
+    colas, cabezas, capacidades = array("i"), array("i"), array("d")
+    for u, v, c in aristas:
+        colas.append(tabla.agregar(u))
+        cabezas.append(tabla.agregar(v))
+        capacidades.append(c)
+    indexadas = []
+    for consulta in consultas:
+        if consulta[0] not in tabla or consulta[1] not in tabla:
+            raise ValueError("El nodo origen o destino no está presente.")
+        indexadas.append((tabla[consulta[0]], tabla[consulta[1]]) + tuple(consulta[2:]))
+    return resolver_consultas(len(tabla), colas, cabezas, capacidades, indexadas, algoritmo, procesos)
+
+
+def main(argv=None):
+    import argparse
+    from formatos_grafo import leer_aristas
+    parser = argparse.ArgumentParser(description="Resuelve muchas consultas s-t sobre una misma red, en paralelo.")
+    parser.add_argument("red", help="grafo en un formato de formatos_grafo (JSONL, lista, DIMACS o binario)")
+    parser.add_argument("consultas", help="JSONL con origen, destino y, opcionalmente, capacidades")
+    parser.add_argument("-a", "--algoritmo", default="ford_fulkerson", choices=sorted(ALGORITMOS))
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--formato", choices=["jsonl", "lista", "dimacs", "binario"])
+    args = parser.parse_args(argv)
+
+    grafo = leer_aristas(args.red, args.formato)
+    consultas = []
+    with open(args.consultas, "r", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip():
+                dato = json.loads(linea)
+                ids = []
+                for nid in (dato["origen"], dato["destino"]):
+                    # DIMACS usa IDs enteros; los JSON pueden traerlos como texto
+                    if nid not in grafo.indice and isinstance(nid, str) and nid.lstrip("-").isdigit():
+                        nid = int(nid)
+                    if nid not in grafo.indice:
+                        raise SystemExit(f"El nodo {nid!r} no está en la red.")
+                    ids.append(grafo.indice[nid])
+                consultas.append((ids[0], ids[1], dato.get("capacidades")))
+    valores = resolver_consultas(grafo.n, grafo.colas, grafo.cabezas, grafo.capacidades, consultas,
+                                 args.algoritmo, args.jobs or None)
+    for (s, t, _), valor in zip(consultas, valores):
+        print(json.dumps({"origen": grafo.nodos[s], "destino": grafo.nodos[t], "flujo_maximo": valor}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
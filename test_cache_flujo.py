@@ -0,0 +1,73 @@
+"""Pruebas de la caché de resultados de flujo (python -m pytest)."""
+import os
+
+from cache_flujo import CacheFlujo
+from nucleo_flujo import resolver_flujo
+
+ARISTAS = [("s", "a", 3), ("a", "t", 2.5), ("s", "b", 1), ("b", "t", 4), ("a", "b", 1)]
+
+
+def test_clave_canonica():
+    clave = CacheFlujo.clave([("s", "a", 7), ("a", "t", 2.5)], "s", "t")
+    assert clave == CacheFlujo.clave([("a", "t", 2.5), ("s", "a", 7.0)], "s", "t")
+    assert clave != CacheFlujo.clave([("s", "a", 7), ("a", "t", 2.5)], "s", "a")
+    assert clave != CacheFlujo.clave([("s", "a", 7), ("a", "t", 3)], "s", "t")
+
+
+def test_acierto_en_memoria():
+    cache = CacheFlujo()
+    assert cache.obtener("x") is None
+    cache.guardar("x", 2.5, {("s", "t"): 2.5})
+    assert cache.obtener("x") == {"valor": 2.5, "flujos": {("s", "t"): 2.5}}
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+
+def test_lru_acotado_por_bytes():
+    cache = CacheFlujo(max_bytes=200)
+    for i in range(10):
+        cache.guardar(f"k{i}", i, {("s", "t"): i})
+        cache.obtener("k0")  # la más usada no se descarta
+    assert 0 < cache.bytes <= 200
+    assert 1 < len(cache) < 10
+    assert cache.obtener("k0") is not None and cache.obtener("k9") is not None
+    assert cache.obtener("k1") is None
+    cache.guardar("enorme", 0, {("s", str(i)): i for i in range(100)})  # más grande que todo el LRU
+    assert cache.obtener("enorme") is None and cache.obtener("k9") is not None
+    cache.limpiar()
+    assert (len(cache), cache.bytes) == (0, 0)
+
+
+def test_disco_compartido(tmp_path):
+    directorio = str(tmp_path / "cache")
+    CacheFlujo(directorio=directorio).guardar("abcd", 3, {("s", 1): 3})
+    otra = CacheFlujo(directorio=directorio)  # otra ejecución u otro proceso
+    assert otra.obtener("abcd") == {"valor": 3, "flujos": {("s", 1): 3}}
+    assert len(otra) == 1  # quedó también en memoria
+    otra.limpiar()
+    assert otra.obtener("abcd") is not None
+
+
+def test_archivo_danado(tmp_path):
+    cache = CacheFlujo(directorio=str(tmp_path))
+    cache.guardar("abcd", 3, {("s", "t"): 3})
+    with open(os.path.join(str(tmp_path), "ab", "abcd.json"), "w", encoding="utf-8") as f:
+        f.write('{"valor": 3, "flu')
+    cache.limpiar()
+    assert cache.obtener("abcd") is None
+    assert cache.fallos == 1
+
+
+def test_resolver_con_cache(tmp_path):
+    cache = CacheFlujo(directorio=str(tmp_path))
+    primera = resolver_flujo(ARISTAS, "s", "t", "dinic", cache=cache)
+    assert not primera.desde_cache
+    # Mismo grafo en otro orden y con otro algoritmo: sale de la caché
+    segunda = resolver_flujo(list(reversed(ARISTAS)), "s", "t", "push_relabel", cache=cache)
+    assert segunda.desde_cache
+    assert segunda.valor == primera.valor == 4
+    assert segunda.flujos() == primera.flujos()
+    lado, corte = segunda.corte_minimo()
+    assert (lado, sorted(corte)) == (primera.corte_minimo()[0], sorted(primera.corte_minimo()[1]))
+    tercera = resolver_flujo(ARISTAS, "s", "t", cache=CacheFlujo(directorio=str(tmp_path)))
+    assert tercera.desde_cache and tercera.flujos() == primera.flujos()
+    assert not resolver_flujo(ARISTAS + [("b", "a", 1)], "s", "t", cache=cache).desde_cache
@@ -0,0 +1,24 @@
+"""Pruebas del árbol de Gomory–Hu (python -m pytest).
+
+Cada corte del árbol se compara con el corte mínimo por fuerza bruta de la
+versión no dirigida del grafo, con los grafos al azar de test_nucleo_flujo.
+"""
+import itertools
+import random
+
+import pytest
+
+from cortes_flujo import arbol_gomory_hu
+from test_nucleo_flujo import GRAFOS, _capacidades, _cerca, _corte_fuerza_bruta, _grafo
+
+
+@pytest.mark.parametrize("tipo", ["enteros", "fracciones", "mezcla"])
+def test_gomory_hu(tipo):
+    azar = random.Random(f"gomory-hu:{tipo}")
+    for _ in range(GRAFOS // 3):
+        n, aristas = _grafo(azar, tipo)
+        # Versión no dirigida: cada arista cuenta en los dos sentidos
+        cap = _capacidades(aristas + [(v, u, c) for u, v, c in aristas])
+        arbol = arbol_gomory_hu(aristas)
+        for u, v in itertools.combinations(arbol.nodos, 2):
+            assert _cerca(arbol.corte_minimo(u, v), _corte_fuerza_bruta(n, cap, u, v))
@@ -0,0 +1,89 @@
+"""Pruebas de la lectura de grafos por líneas y del formato binario (python -m pytest)."""
+import pytest
+
+from formatos_grafo import cargar_binario, detectar_formato, guardar_binario, leer_aristas
+
+
+def _escribir(tmp_path, nombre, texto):
+    ruta = tmp_path / nombre
+    ruta.write_text(texto, encoding="utf-8")
+    return str(ruta)
+
+
+def _aristas(grafo):
+    nodos = grafo.nodos
+    return [(nodos[u], nodos[v], c) for u, v, c in zip(grafo.colas, grafo.cabezas, grafo.capacidades)]
+
+
+def test_jsonl(tmp_path):
+    ruta = _escribir(tmp_path, "red.jsonl", '{"origen": "s", "destino": "t"}\n["s", "a", 3]\n\n'
+                                            '{"u": "a", "v": "t", "c": 2.5}\n{"u": "s", "v": "t", "capacidad": 1}\n')
+    grafo = leer_aristas(ruta)
+    assert (grafo.origen, grafo.destino) == ("s", "t")
+    assert _aristas(grafo) == [("s", "a", 3.0), ("a", "t", 2.5), ("s", "t", 1.0)]
+
+
+def test_lista(tmp_path):
+    ruta = _escribir(tmp_path, "red.txt", "# comentario\ns a 3\na t 2.5  # al final\n\n")
+    assert detectar_formato(ruta) == "lista"
+    assert _aristas(leer_aristas(ruta)) == [("s", "a", 3.0), ("a", "t", 2.5)]
+
+
+def test_dimacs(tmp_path):
+    ruta = _escribir(tmp_path, "red.max", "c ejemplo\np max 3 2\nn 1 s\nn 3 t\na 1 2 4\na 2 3 5\n")
+    grafo = leer_aristas(ruta)
+    assert (grafo.n, grafo.origen, grafo.destino) == (3, 1, 3)
+    assert _aristas(grafo) == [(1, 2, 4.0), (2, 3, 5.0)]
+
+
+@pytest.mark.parametrize("nombre,texto,linea", [
+    ("sin_capacidad.jsonl", '["s", "a", 1]\n{"u": "a", "v": "t"}\n', 2),
+    ("capacidad_texto.jsonl", '["s", "a", "mucho"]\n', 1),
+    ("corta.jsonl", '["s", "a"]\n', 1),
+    ("rota.jsonl", '["s", "a", 1]\n["s",\n', 2),
+    ("corta.txt", "s a 1\na t\n", 2),
+    ("capacidad.txt", "s a uno\n", 1),
+    ("n_corta.max", "p max 2 1\nn 1\n", 2),
+    ("a_corta.max", "p max 2 1\na 1 2\n", 2),
+    ("a_texto.max", "p max 2 1\na 1 dos 3\n", 2),
+    ("p_corta.max", "p max\n", 1),
+])
+def test_lineas_invalidas(tmp_path, nombre, texto, linea):
+    # Siempre ValueError con el número de línea (lote_flujo lo informa sin traceback)
+    with pytest.raises(ValueError, match=f"^Línea {linea}:"):
+        leer_aristas(_escribir(tmp_path, nombre, texto))
+
+
+def test_binario_ida_y_vuelta(tmp_path):
+    ruta = str(tmp_path / "red.fbin")
+    nodos = ["s", "a", 7, "t"]
+    guardar_binario(ruta, nodos, [0, 1, 2, 0], [1, 2, 3, 3], [3, 2.5, 4, 1], origen=0, destino=3, flujos=[2.5, 2.5, 2.5, 1])
+    assert detectar_formato(ruta) == "binario"
+    grafo = leer_aristas(ruta)
+    assert grafo.nodos == nodos
+    assert (grafo.origen, grafo.destino) == ("s", "t")
+    assert _aristas(grafo) == [("s", "a", 3.0), ("a", 7, 2.5), (7, "t", 4.0), ("s", "t", 1.0)]
+    assert list(grafo.flujos) == [2.5, 2.5, 2.5, 1.0]
+    with pytest.raises(TypeError):
+        grafo.capacidades[0] = 9  # vista de solo lectura sobre el archivo
+
+
+def test_binario_sin_flujos_ni_extremos(tmp_path):
+    ruta = str(tmp_path / "red.fbin")
+    guardar_binario(ruta, [0, 1], [0], [1], [5])
+    grafo = cargar_binario(ruta)
+    assert (grafo.origen, grafo.destino, grafo.flujos) == (None, None, None)
+    assert _aristas(grafo) == [(0, 1, 5.0)]
+
+
+def test_binario_truncado(tmp_path):
+    ruta = tmp_path / "red.fbin"
+    guardar_binario(str(ruta), ["s", "t"], [0], [1], [5])
+    ruta.write_bytes(ruta.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="truncado"):
+        cargar_binario(str(ruta))
+
+
+def test_binario_arreglos_desparejos(tmp_path):
+    with pytest.raises(ValueError):
+        guardar_binario(str(tmp_path / "red.fbin"), ["s", "t"], [0, 1], [1], [5])
@@ -0,0 +1,40 @@
+"""Pruebas del modo por lotes (python -m pytest)."""
+import functools
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import lote_flujo
+
+
+def _tarea(i):
+    grafo = {"aristas": [["a", "b", i + 1], ["b", "c", 2*i + 1]], "origen": "a", "destino": "c"}
+    return (f"g{i}", None, json.dumps(grafo))
+
+
+def test_paralelo_lee_la_entrada_de_a_poco():
+    leidas = []
+
+    def tareas():
+        for i in itertools.count():  # entrada sin fin, como stdin
+            leidas.append(i)
+            yield _tarea(i)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        resultados = lote_flujo._resolver_en_paralelo(pool, functools.partial(lote_flujo.resolver_tarea), tareas(), 2)
+        primeros = list(itertools.islice(resultados, 40))
+    assert [r["grafo"] for r in primeros] == [f"g{i}" for i in range(40)]
+    assert [r["flujo_maximo"] for r in primeros] == [i + 1 for i in range(40)]
+    assert len(leidas) <= 40 + lote_flujo.ENVIOS_POR_PROCESO * 2 * lote_flujo.TAREAS_POR_ENVIO
+
+
+def test_main_en_paralelo_conserva_el_orden(tmp_path):
+    entrada = tmp_path / "grafos.jsonl"
+    entrada.write_text("".join(_tarea(i)[2] + "\n" for i in range(100)) + "{\n", encoding="utf-8")
+    salidas = []
+    for jobs in ("1", "3"):
+        salida = tmp_path / f"salida{jobs}.jsonl"
+        assert lote_flujo.main([str(entrada), "-j", jobs, "-o", str(salida)]) == 1  # la última línea no es JSON
+        salidas.append(salida.read_text(encoding="utf-8").splitlines())
+    assert salidas[0] == salidas[1]
+    assert [json.loads(r).get("flujo_maximo") for r in salidas[0]] == [i + 1 for i in range(100)] + [None]
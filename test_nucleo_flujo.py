@@ -0,0 +1,177 @@
+"""Pruebas del núcleo de flujo máximo (python -m pytest).
+
+Cada algoritmo registrado, la reducción previa y Hopcroft–Karp se comparan
+con un corte mínimo por fuerza bruta (todos los subconjuntos de nodos) sobre
+grafos chicos al azar con semilla fija.
+"""
+import itertools
+import random
+
+import pytest
+
+from nucleo_flujo import ALGORITMOS, resolver_flujo
+
+GRAFOS = 300
+EPS = 1e-12  # ruido de punto flotante admitido (relativo a las capacidades en juego)
+
+
+def _capacidad(azar, tipo):
+    if tipo == "enteros":
+        return azar.randint(0, 10)
+    if tipo == "fracciones":
+        return round(azar.uniform(0, 10), 1)
+    # Magnitudes mezcladas: el redondeo de las capacidades grandes supera a las chicas
+    if azar.random() < 0.5:
+        return round(azar.uniform(1e5, 1e6), 1)
+    return round(azar.uniform(0.001, 0.01), 4)
+
+
+def _grafo(azar, tipo):
+    # Nodos 0..n-1 con s = 0 y t = n-1; lazos, paralelas y capacidades nulas incluidas
+    n = azar.randint(3, 8)
+    aristas = []
+    for _ in range(azar.randint(1, 24)):
+        u, v = azar.randrange(n), azar.randrange(n)
+        aristas.append((u, v, _capacidad(azar, tipo)))
+    aristas += [(0, 1, 1), (1, n - 1, 1)]  # s y t siempre presentes
+    return n, aristas
+
+
+def _capacidades(aristas):
+    cap = {}
+    for u, v, c in aristas:
+        cap[(u, v)] = cap.get((u, v), 0) + c
+    return cap
+
+
+def _corte_fuerza_bruta(n, cap, s, t):
+    otros = [x for x in range(n) if x != s and x != t]
+    mejor = None
+    for k in range(len(otros) + 1):
+        for extra in itertools.combinations(otros, k):
+            lado = {s, *extra}
+            valor = sum(c for (u, v), c in cap.items() if u in lado and v not in lado)
+            if mejor is None or valor < mejor:
+                mejor = valor
+    return mejor
+
+
+def _cerca(a, b):
+    return abs(a - b) <= EPS * max(1, abs(a), abs(b))
+
+
+def _verificar(solucion, n, aristas, s, t):
+    cap = _capacidades(aristas)
+    assert _cerca(solucion.valor, _corte_fuerza_bruta(n, cap, s, t))
+
+    # Capacidad y conservación; el error admitido en cada nodo es relativo a
+    # las capacidades que lo tocan, no al flujo (que puede ser mucho menor)
+    balance, magnitud = [0]*n, [0]*n
+    for (u, v), c in cap.items():
+        magnitud[u] += c
+        magnitud[v] += c
+    for (u, v), f in solucion.flujos().items():
+        assert -EPS <= f <= cap[(u, v)] * (1 + EPS)
+        balance[u] -= f
+        balance[v] += f
+    for x in range(n):
+        if x != s and x != t:
+            assert abs(balance[x]) <= EPS * max(1, magnitud[x])
+    # En t también: puede haber ciclos que pasan por t con flujos grandes
+    assert abs(balance[t] - solucion.valor) <= EPS * max(1, magnitud[t])
+
+    # Corte mínimo: separa s de t, sus aristas cruzan y suman el valor
+    lado, corte = solucion.corte_minimo()
+    assert s in lado and t not in lado
+    assert all(u in lado and v not in lado for u, v in corte)
+    assert all(_cerca(solucion.flujos().get(p, 0), cap[p]) for p in corte)  # saturadas
+    assert _cerca(sum(cap[p] for p in corte), solucion.valor)
+
+
+@pytest.mark.parametrize("tipo", ["enteros", "fracciones", "mezcla"])
+@pytest.mark.parametrize("reducir", [False, True], ids=["directo", "reducido"])
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_algoritmos(algoritmo, reducir, tipo):
+    azar = random.Random(f"{algoritmo}:{reducir}:{tipo}")
+    for _ in range(GRAFOS):
+        n, aristas = _grafo(azar, tipo)
+        solucion = resolver_flujo(aristas, 0, n - 1, algoritmo, reducir=reducir, bipartito=False)
+        _verificar(solucion, n, aristas, 0, n - 1)
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_flujo_chico_junto_a_capacidad_grande(algoritmo):
+    # Los 0.0004 que pasan por s->a no se pueden redondear a 0 por ser chicos
+    # frente a la capacidad de la arista
+    aristas = [("s", "a", 1e6 + 0.5), ("a", "t", 0.0004)]
+    for reducir in (False, True):
+        flujos = resolver_flujo(aristas, "s", "t", algoritmo, reducir=reducir).flujos()
+        assert flujos[("a", "t")] == 0.0004
+        if algoritmo == "push_relabel" and not reducir:
+            # Empuja 1e6 + 0.5 por s->a y devuelve el exceso: la resta es a escala 1e6
+            assert abs(flujos[("s", "a")] - 0.0004) <= EPS * 1e6
+        else:
+            assert flujos[("s", "a")] == 0.0004  # se lee del arco inverso, sin restar a 1e6
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_corte_con_residual_chico_real(algoritmo):
+    # 0.0004 de residual en s->a es capacidad libre, no ruido: el corte es a->t
+    aristas = [("s", "a", 1e6 + 0.5), ("a", "t", 1e6 + 0.4996)]
+    lado, corte = resolver_flujo(aristas, "s", "t", algoritmo).corte_minimo()
+    assert lado == {"s", "a"}
+    assert corte == [("a", "t")]
+
+
+def test_reducir_paralelas_de_magnitudes_mezcladas():
+    # Al repartir entre paralelas, la resta con capacidades del orden de 1e5
+    # deja restos de redondeo mayores que las ramas chicas: no son flujo ni
+    # capacidad libre
+    aristas = [(2, 2, 761015.5), (0, 0, 0.006), (1, 4, 0.0061), (3, 2, 733699.1), (0, 2, 0.0064),
+               (2, 2, 827851.5), (4, 0, 529692.3), (1, 2, 0.0073), (0, 3, 827027.0), (2, 2, 0.0079),
+               (4, 1, 276241.9), (0, 1, 612809.1), (2, 3, 0.006), (2, 0, 0.0067), (1, 4, 621926.2),
+               (1, 1, 188623.8), (0, 4, 0.0031), (2, 1, 0.0062), (3, 2, 0.0052), (0, 1, 1), (1, 4, 1)]
+    for algoritmo in ALGORITMOS:
+        _verificar(resolver_flujo(aristas, 0, 4, algoritmo, reducir=True), 5, aristas, 0, 4)
+
+
+@pytest.mark.parametrize("algoritmo", ["ford_fulkerson", "dinic", "push_relabel"])
+def test_reanudar_tras_editar(algoritmo):
+    # Bajar, subir y quitar capacidades o agregar aristas, y reanudar desde
+    # el flujo anterior: el flujo reparado debe ser válido y máximo
+    azar = random.Random(f"reanudar:{algoritmo}")
+    for _ in range(GRAFOS):
+        n, aristas = _grafo(azar, "fracciones" if azar.random() < 0.5 else "enteros")
+        previo = resolver_flujo(aristas, 0, n - 1, algoritmo, bipartito=False)
+        editadas = [(u, v, c * azar.choice([0, 0.5, 1, 1, 2])) for u, v, c in aristas]
+        editadas.append((azar.randrange(n), azar.randrange(n), azar.randint(1, 10)))
+        solucion = resolver_flujo(editadas, 0, n - 1, algoritmo, previo=previo, bipartito=False)
+        assert solucion.incremental
+        _verificar(solucion, n, editadas, 0, n - 1)
+
+
+def test_reanudar_otro_par_resuelve_desde_cero():
+    aristas = [(0, 1, 3), (1, 2, 2), (0, 2, 1)]
+    previo = resolver_flujo(aristas, 0, 2)
+    solucion = resolver_flujo(aristas, 0, 1, previo=previo)
+    assert not solucion.incremental
+    _verificar(solucion, 3, aristas, 0, 1)
+
+
+def test_escalamiento_fracciones_periodicas():
+    # 1/3 y 1/7 no entran en DECIMALES_MAX decimales: no se deben redondear
+    aristas = [(0, 1, 1/3), (1, 3, 1/3), (0, 2, 2/3), (2, 3, 0.5), (1, 2, 1/7)]
+    solucion = resolver_flujo(aristas, 0, 3, "escalamiento")
+    _verificar(solucion, 4, aristas, 0, 3)
+
+
+def test_hopcroft_karp():
+    azar = random.Random("bipartito")
+    for _ in range(GRAFOS):
+        izq, der = azar.randint(1, 4), azar.randint(1, 4)
+        s, t = izq + der, izq + der + 1
+        aristas = [(s, i, 1) for i in range(izq)] + [(izq + j, t, 1) for j in range(der)]
+        aristas += [(i, izq + j, 1) for i in range(izq) for j in range(der) if azar.random() < 0.4]
+        solucion = resolver_flujo(aristas, s, t, "dinic", bipartito=True)
+        assert solucion.bipartito
+        _verificar(solucion, izq + der + 2, aristas, s, t)
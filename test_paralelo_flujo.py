@@ -0,0 +1,85 @@
+"""Pruebas de las consultas en paralelo sobre una misma red (python -m pytest)."""
+import json
+import random
+
+import pytest
+
+from nucleo_flujo import resolver_flujo
+from paralelo_flujo import main, resolver_consultas, resolver_consultas_ids
+
+
+def _red(azar, n=8, m=30):
+    colas = [azar.randrange(n) for _ in range(m)]
+    cabezas = [azar.randrange(n) for _ in range(m)]
+    capacidades = [azar.randint(0, 10) for _ in range(m)]
+    return n, colas, cabezas, capacidades
+
+
+def _consultas(azar, n, m):
+    consultas = []
+    for _ in range(20):
+        s, t = azar.sample(range(n), 2)
+        if azar.random() < 0.5:
+            consultas.append((s, t))
+        else:
+            consultas.append((s, t, [round(azar.uniform(0, 10), 1) for _ in range(m)]))
+    return consultas
+
+
+def _esperado(colas, cabezas, capacidades, consulta):
+    caps = consulta[2] if len(consulta) > 2 else capacidades
+    return resolver_flujo(list(zip(colas, cabezas, caps)), consulta[0], consulta[1]).valor
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_consultas_con_escenarios(procesos):
+    azar = random.Random("consultas")
+    n, colas, cabezas, capacidades = _red(azar)
+    consultas = _consultas(azar, n, len(colas))
+    valores = resolver_consultas(n, colas, cabezas, capacidades, consultas, "dinic", procesos)
+    assert valores == pytest.approx([_esperado(colas, cabezas, capacidades, c) for c in consultas])
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_consultas_con_flujos(procesos):
+    colas, cabezas, capacidades = [0, 0, 1, 2, 1], [1, 2, 3, 3, 2], [3, 2, 2, 3, 1]
+    consultas = [(0, 3), (0, 3, [1, 1, 1, 1, 0]), (1, 3)]
+    resultados = resolver_consultas(4, colas, cabezas, capacidades, consultas, procesos=procesos, con_flujos=True)
+    assert [valor for valor, _ in resultados] == [5, 2, 3]
+    for (s, t, *caps), (valor, flujos) in zip(consultas, resultados):
+        caps = caps[0] if caps else capacidades
+        assert len(flujos) == len(colas)
+        assert all(0 <= f <= c for f, c in zip(flujos, caps))
+        entra = sum(f for v, f in zip(cabezas, flujos) if v == t)
+        assert entra == valor
+
+
+def test_consultas_invalidas():
+    with pytest.raises(ValueError):
+        resolver_consultas(2, [0], [1], [1], [(0, 0)], procesos=1)
+    with pytest.raises(ValueError):
+        resolver_consultas(2, [0], [1], [1], [(0, 2)], procesos=1)
+    with pytest.raises(ValueError):
+        resolver_consultas(2, [0], [1], [1], [(0, 1, [1, 2])], procesos=1)
+    with pytest.raises(ValueError):
+        resolver_consultas(2, [0], [1], [1], [(0, 1)], "otro", procesos=1)
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_consultas_por_ids(procesos):
+    aristas = [("s", "a", 3), ("a", "t", 2), ("s", "t", 1)]
+    consultas = [("s", "t"), ("s", "a"), ("s", "t", [0, 2, 1]), ("a", "t")]
+    assert resolver_consultas_ids(aristas, consultas, procesos=procesos) == [3, 3, 1, 2]
+    with pytest.raises(ValueError):
+        resolver_consultas_ids(aristas, [("s", "x")], procesos=procesos)
+
+
+def test_main(tmp_path, capsys):
+    red = tmp_path / "red.max"
+    red.write_text("p max 3 2\na 1 2 4\na 2 3 5\n", encoding="utf-8")
+    consultas = tmp_path / "consultas.jsonl"
+    consultas.write_text('{"origen": 1, "destino": 3}\n\n{"origen": "1", "destino": "2", "capacidades": [2, 5]}\n',
+                         encoding="utf-8")
+    assert main([str(red), str(consultas), "-j", "1"]) == 0
+    salida = [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+    assert salida == [{"origen": 1, "destino": 3, "flujo_maximo": 4}, {"origen": 1, "destino": 2, "flujo_maximo": 2}]